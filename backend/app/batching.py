@@ -0,0 +1,86 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """
+    Base class for micro-batching work onto a single worker thread.
+
+    Callers `_enqueue` one item each and get a Future back; the worker
+    gathers items for up to `max_wait` seconds (or until `max_batch_size`
+    are queued) and hands them to `_process`, which returns one result per
+    item. A result that is an exception fails only that item's future; an
+    exception raised by `_process` fails the whole batch.
+    """
+
+    thread_name = "micro-batcher"
+
+    def __init__(self, max_batch_size: int, max_wait: float):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def _process(self, items: list) -> list:
+        raise NotImplementedError
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            with self._lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+                    self._worker.start()
+
+    def _enqueue(self, item) -> Future:
+        fut = Future()
+        self._queue.put((item, fut))
+        self._ensure_worker()
+        return fut
+
+    def _collect(self):
+        item = self._queue.get()
+        if item is None:
+            return None
+        batch = [item]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                # Put the sentinel back so the loop exits after this batch
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            futures = [fut for _, fut in batch]
+            try:
+                results = self._process([item for item, _ in batch])
+            except Exception as e:
+                for fut in futures:
+                    fut.set_exception(e)
+                continue
+            for fut, result in zip(futures, results):
+                if isinstance(result, Exception):
+                    fut.set_exception(result)
+                else:
+                    fut.set_result(result)
+
+    def close(self):
+        """Stop the worker after draining items that are already queued."""
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join()
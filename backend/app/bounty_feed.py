@@ -0,0 +1,69 @@
+from collections import defaultdict
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from . import models
+from .schemas import BountyOut
+
+
+def _current_videos_query(bounty_ids):
+    # Keep the first submitted video per (bounty, video creator), like the old Python-side dedupe
+    ranked = (
+        select(
+            models.BountySubmission.bounty_id.label("bounty_id"),
+            models.BountySubmission.id.label("submission_id"),
+            models.Video.id.label("id"),
+            models.Video.title.label("title"),
+            models.Video.creator_handle.label("creator_handle"),
+            models.Video.views.label("views"),
+            models.Video.length.label("duration"),
+            models.Video.votes.label("votes"),
+            models.Video.likes.label("likes"),
+            func.row_number().over(
+                partition_by=(models.BountySubmission.bounty_id, models.Video.creator_handle),
+                order_by=models.BountySubmission.id,
+            ).label("rn"),
+        )
+        .join(models.Video, models.Video.id == models.BountySubmission.video_id)
+        .where(models.BountySubmission.bounty_id.in_(bounty_ids))
+        .subquery()
+    )
+    return (
+        select(
+            ranked.c.bounty_id, ranked.c.id, ranked.c.title, ranked.c.creator_handle,
+            ranked.c.views, ranked.c.duration, ranked.c.votes, ranked.c.likes,
+        )
+        .where(ranked.c.rn == 1)
+        .order_by(ranked.c.bounty_id, ranked.c.submission_id)
+    )
+
+
+def load_bounty_feed(db: Session, bounty_ids: list[int]) -> list[BountyOut]:
+    """
+    Serialize the given bounties, in order, with their current videos.
+    Always runs two queries regardless of how many bounties or submissions exist.
+    """
+    if not bounty_ids:
+        return []
+    bounties = {b.id: b for b in db.query(models.Bounty).filter(models.Bounty.id.in_(bounty_ids))}
+    videos = defaultdict(list)
+    for row in db.execute(_current_videos_query(bounty_ids)):
+        bounty_id, *video = row
+        videos[bounty_id].append(dict(zip(("id", "title", "creator_handle", "views", "duration", "votes", "likes"), video)))
+    return [
+        BountyOut(
+            id=bounty.id,
+            creator_handle=bounty.creator_handle,
+            description=bounty.description,
+            prize_pool=bounty.prize_pool,
+            cutoff_date=bounty.cutoff_date.isoformat(),
+            judging_start=bounty.judging_start.isoformat(),
+            judging_end=bounty.judging_end.isoformat(),
+            is_closed=bounty.is_closed,
+            current_videos=videos[bounty.id],
+            following=bounty.following,
+        )
+        for bounty in (bounties.get(i) for i in bounty_ids)
+        if bounty is not None
+    ]
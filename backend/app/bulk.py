@@ -0,0 +1,228 @@
+"""
+Bulk import and export of the core tables as NDJSON or CSV.
+
+Exports stream rows through a server-side cursor (`yield_per`) and
+imports insert in fixed-size Core executemany chunks, so memory stays flat
+regardless of table size. The same functions back the /bulk endpoints and
+the CLI:
+
+    python -m app.bulk export session_events --output events.ndjson
+    python -m app.bulk import users users.csv
+"""
+import argparse
+import codecs
+import csv
+import io
+import json
+import sys
+import time
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, Float, Integer, insert, select
+
+from . import models
+from .voting import recount_votes
+
+TABLES = {
+    "users": models.User,
+    "videos": models.Video,
+    "bounties": models.Bounty,
+    "submissions": models.BountySubmission,
+    "votes": models.BountyVote,
+    "session_events": models.SessionEvent,
+}
+FORMATS = ("ndjson", "csv")
+
+
+def get_model(table: str):
+    try:
+        return TABLES[table]
+    except KeyError:
+        raise ValueError(f"Unknown table {table!r}; expected one of {', '.join(TABLES)}")
+
+
+def _encode(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _parse_bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "t", "yes")
+    return bool(value)
+
+
+def _coercers(model) -> dict:
+    """Column name -> converter from NDJSON/CSV values to the column's Python type."""
+    converters = {}
+    for column in model.__table__.columns:
+        if isinstance(column.type, DateTime):
+            convert = lambda v: v if isinstance(v, datetime) else datetime.fromisoformat(v)
+        elif isinstance(column.type, Boolean):
+            convert = _parse_bool
+        elif isinstance(column.type, Integer):
+            convert = int
+        elif isinstance(column.type, Float):
+            convert = float
+        else:
+            convert = str
+        converters[column.name] = convert
+    return converters
+
+
+def export_rows(engine, model, chunk_size: int = 10000):
+    """Yield every row of the table as a dict, in primary key order."""
+    table = model.__table__
+    stmt = select(table).order_by(*table.primary_key.columns)
+    with engine.connect() as conn:
+        result = conn.execution_options(yield_per=chunk_size).execute(stmt)
+        for partition in result.partitions():
+            for row in partition:
+                yield {key: _encode(value) for key, value in row._mapping.items()}
+
+
+def format_rows(rows, fmt: str, columns: list[str]):
+    """Serialise dict rows to NDJSON or CSV text chunks."""
+    if fmt == "ndjson":
+        for row in rows:
+            yield json.dumps(row) + "\n"
+        return
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns)
+    writer.writeheader()
+    for i, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if i % 1000 == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def iter_lines(chunks):
+    """Split an iterable of byte chunks into text lines, keeping line endings."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def parse_rows(lines, fmt: str):
+    """Parse NDJSON or CSV lines into dicts; empty CSV fields become None."""
+    if fmt == "ndjson":
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+        return
+    for row in csv.DictReader(lines):
+        yield {key: (value if value != "" else None) for key, value in row.items()}
+
+
+def _runs_by_keys(batch):
+    """Split a batch into consecutive runs of rows with the same keys."""
+    start = 0
+    for i in range(1, len(batch) + 1):
+        if i == len(batch) or batch[i].keys() != batch[start].keys():
+            yield batch[start:i]
+            start = i
+
+
+def import_rows(engine, model, rows, chunk_size: int = 5000) -> int:
+    """
+    Insert dict rows in chunks of `chunk_size`, one transaction per chunk.
+    Unknown columns are rejected; missing ones take the column default.
+    Imported votes are added to their submissions' live tallies.
+    Returns the number of rows inserted.
+    """
+    converters = _coercers(model)
+    stmt = insert(model)
+    inserted = 0
+    batch = []
+
+    def flush():
+        nonlocal inserted
+        with engine.begin() as conn:
+            # One executemany needs one key set, so rows that omit different columns go separately
+            for run in _runs_by_keys(batch):
+                conn.execute(stmt, run)
+            if model is models.BountyVote:
+                recount_votes(conn, {row.get("submission_id") for row in batch})
+        inserted += len(batch)
+        batch.clear()
+
+    for n, row in enumerate(rows, 1):
+        unknown = set(row) - converters.keys()
+        if unknown:
+            raise ValueError(f"Row {n}: unknown columns {sorted(unknown)} for {model.__tablename__}")
+        batch.append({key: converters[key](value) if value is not None else None for key, value in row.items()})
+        if len(batch) >= chunk_size:
+            flush()
+    if batch:
+        flush()
+    return inserted
+
+
+def _format_for(path: str | None, fmt: str | None) -> str:
+    if fmt:
+        return fmt
+    return "csv" if path and path.endswith(".csv") else "ndjson"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="write a table to a file (or stdout)")
+    export.add_argument("table", choices=TABLES)
+    export.add_argument("--output", help="defaults to stdout")
+    export.add_argument("--format", choices=FORMATS, help="defaults to the output extension, else ndjson")
+    export.add_argument("--chunk-size", type=int, default=10000)
+    load = sub.add_parser("import", help="insert rows from a file (or stdin)")
+    load.add_argument("table", choices=TABLES)
+    load.add_argument("input", nargs="?", help="defaults to stdin")
+    load.add_argument("--format", choices=FORMATS, help="defaults to the input extension, else ndjson")
+    load.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    from .db import Base, engine
+    from .migrations import upgrade_schema_from_env
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema_from_env(engine)
+    model = get_model(args.table)
+    start = time.perf_counter()
+    if args.command == "export":
+        fmt = _format_for(args.output, args.format)
+        columns = [column.name for column in model.__table__.columns]
+        out = open(args.output, "w", newline="") if args.output else sys.stdout
+        count = 0
+
+        def counted(rows):
+            nonlocal count
+            for row in rows:
+                count += 1
+                yield row
+
+        try:
+            for text in format_rows(counted(export_rows(engine, model, args.chunk_size)), fmt, columns):
+                out.write(text)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        print(f"exported {count} {args.table} rows in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    else:
+        fmt = _format_for(args.input, args.format)
+        src = open(args.input, newline="") if args.input else sys.stdin
+        try:
+            count = import_rows(engine, model, parse_rows(src, fmt), chunk_size=args.chunk_size)
+        finally:
+            if src is not sys.stdin:
+                src.close()
+        print(f"imported {count} {args.table} rows in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
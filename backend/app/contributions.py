@@ -0,0 +1,113 @@
+import os
+from collections import defaultdict
+from concurrent.futures import Future
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from . import models
+from .batching import MicroBatcher
+
+
+class ContributionError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def _debit_viewer(conn, viewer_handle: str, amount: float):
+    # The balance guard lives in the WHERE clause, so concurrent debits can't overdraw
+    result = conn.execute(
+        update(models.User)
+        .where(models.User.handle == viewer_handle, models.User.wallet >= amount)
+        .values(wallet=models.User.wallet - amount, total_donations=models.User.total_donations + amount)
+    )
+    if result.rowcount == 0:
+        raise ContributionError(400, "Viewer not found or insufficient wallet balance")
+
+
+def _credit_bounty(conn, bounty_id: int, amount: float) -> float:
+    new_pool = conn.execute(
+        update(models.Bounty)
+        .where(models.Bounty.id == bounty_id, models.Bounty.is_closed == False)
+        .values(prize_pool=models.Bounty.prize_pool + amount)
+        .returning(models.Bounty.prize_pool)
+    ).scalar()
+    if new_pool is None:
+        raise ContributionError(404, "Bounty not found or closed")
+    return float(new_pool)
+
+
+def contribute(db: Session, bounty_id: int, viewer_handle: str, amount: float) -> float:
+    """
+    Record one donation in a single short transaction using SQL-side
+    increments. Returns the bounty's new prize pool.
+    """
+    try:
+        _debit_viewer(db, viewer_handle, amount)
+        new_pool = _credit_bounty(db, bounty_id, amount)
+        db.execute(insert(models.BountyContribution).values(bounty_id=bounty_id, viewer_handle=viewer_handle, amount=amount))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return new_pool
+
+
+class ContributionBatcher(MicroBatcher):
+    """
+    Coalesces concurrent donations into one transaction per batch: each
+    donation is debited individually, but every bounty gets a single
+    `prize_pool = prize_pool + sum` update and contributions are inserted
+    with one executemany.
+    """
+
+    thread_name = "contribution-batcher"
+
+    def __init__(self, engine, max_batch_size: int = 256, max_wait: float = 0.01):
+        super().__init__(max_batch_size, max_wait)
+        self.engine = engine
+
+    def submit(self, bounty_id: int, viewer_handle: str, amount: float) -> Future:
+        return self._enqueue((bounty_id, viewer_handle, amount))
+
+    def contribute(self, bounty_id: int, viewer_handle: str, amount: float) -> float:
+        return self.submit(bounty_id, viewer_handle, amount).result()
+
+    def _process(self, items: list) -> list:
+        """New prize pool per donation, or the ContributionError it failed with."""
+        failed = {}
+        with self.engine.begin() as conn:
+            bounty_ids = {bounty_id for bounty_id, _, _ in items}
+            open_ids = set(conn.execute(
+                select(models.Bounty.id).where(models.Bounty.id.in_(bounty_ids), models.Bounty.is_closed == False)
+            ).scalars())
+            totals = defaultdict(float)
+            rows = []
+            for i, (bounty_id, viewer_handle, amount) in enumerate(items):
+                if bounty_id not in open_ids:
+                    failed[i] = ContributionError(404, "Bounty not found or closed")
+                    continue
+                try:
+                    _debit_viewer(conn, viewer_handle, amount)
+                except ContributionError as e:
+                    failed[i] = e
+                    continue
+                totals[bounty_id] += amount
+                rows.append({"bounty_id": bounty_id, "viewer_handle": viewer_handle, "amount": amount})
+            pools = {bounty_id: _credit_bounty(conn, bounty_id, total) for bounty_id, total in totals.items()}
+            if rows:
+                conn.execute(insert(models.BountyContribution), rows)
+        return [failed[i] if i in failed else pools[bounty_id] for i, (bounty_id, _, _) in enumerate(items)]
+
+
+def create_contribution_batcher(engine) -> ContributionBatcher | None:
+    """Batch mode is opt-in via CONTRIBUTION_BATCH_MODE=true."""
+    if os.getenv("CONTRIBUTION_BATCH_MODE", "false").lower() != "true":
+        return None
+    return ContributionBatcher(
+        engine,
+        max_batch_size=int(os.getenv("CONTRIBUTION_BATCH_MAX_SIZE", "256")),
+        max_wait=float(os.getenv("CONTRIBUTION_BATCH_WINDOW_MS", "10")) / 1000.0,
+    )
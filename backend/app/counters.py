@@ -0,0 +1,133 @@
+import os
+import threading
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from . import models
+
+COUNTER_FIELDS = ("views", "likes", "votes")
+
+
+class VideoCounterBuffer:
+    """
+    Sharded in-memory buffer of view/like/vote increments.
+
+    Increments are summed per video in one of `shards` dicts (picked by
+    video id) so concurrent writers rarely contend on the same lock. A
+    background thread periodically swaps the shards out and applies the
+    aggregated deltas with one `UPDATE videos SET views = views + ?`
+    statement per batch. Deltas stay visible to `pending` while a flush is
+    in flight, so reads can merge them with the stored totals.
+    """
+
+    def __init__(self, engine, shards: int = 16, batch_size: int = 1000, flush_interval: float = 1.0):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._shards = [{} for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._listeners = []
+        self._statement = (
+            update(models.Video)
+            .where(models.Video.id == bindparam("video_id"))
+            .values(**{field: getattr(models.Video, field) + bindparam(f"d_{field}") for field in COUNTER_FIELDS})
+        )
+
+    def add_listener(self, callback):
+        """Register `callback(video_ids)`, called after each successful flush."""
+        self._listeners.append(callback)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="video-counter-flusher", daemon=True)
+            self._thread.start()
+
+    def add(self, video_id: int, views: int = 0, likes: int = 0, votes: int = 0):
+        shard = video_id % len(self._shards)
+        with self._locks[shard]:
+            counts = self._shards[shard].get(video_id)
+            if counts is None:
+                self._shards[shard][video_id] = [views, likes, votes]
+            else:
+                counts[0] += views
+                counts[1] += likes
+                counts[2] += votes
+
+    def pending(self, video_id: int) -> dict:
+        """Deltas not yet committed to the videos table."""
+        shard = video_id % len(self._shards)
+        with self._locks[shard]:
+            counts = list(self._shards[shard].get(video_id, (0, 0, 0)))
+        with self._inflight_lock:
+            inflight = self._inflight.get(video_id)
+            if inflight is not None:
+                counts = [a + b for a, b in zip(counts, inflight)]
+        return dict(zip(COUNTER_FIELDS, counts))
+
+    def merge(self, video_id: int, stored: dict) -> dict:
+        """Stored totals plus pending deltas."""
+        pending = self.pending(video_id)
+        return {field: (stored.get(field) or 0) + pending[field] for field in COUNTER_FIELDS}
+
+    def _swap(self) -> dict:
+        merged = {}
+        for i, lock in enumerate(self._locks):
+            with lock:
+                shard, self._shards[i] = self._shards[i], {}
+            merged.update(shard)
+        return merged
+
+    def flush(self) -> int:
+        """Apply all pending deltas. Returns the number of videos updated."""
+        with self._flush_lock:
+            with self._inflight_lock:
+                self._inflight = self._swap()
+                deltas = list(self._inflight.items())
+            if not deltas:
+                return 0
+            try:
+                with self.engine.begin() as conn:
+                    for i in range(0, len(deltas), self.batch_size):
+                        conn.execute(self._statement, [
+                            {"video_id": video_id, **{f"d_{field}": n for field, n in zip(COUNTER_FIELDS, counts)}}
+                            for video_id, counts in deltas[i:i + self.batch_size]
+                        ])
+            except SQLAlchemyError as e:
+                print(f"Error flushing counters for {len(deltas)} videos, will retry: {e}")
+                for video_id, counts in deltas:
+                    self.add(video_id, *counts)
+                return 0
+            finally:
+                with self._inflight_lock:
+                    self._inflight = {}
+            for callback in self._listeners:
+                callback([video_id for video_id, _ in deltas])
+            return len(deltas)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        """Stop the flusher and write out anything still buffered."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+
+def create_counter_buffer(engine) -> VideoCounterBuffer:
+    return VideoCounterBuffer(
+        engine,
+        shards=int(os.getenv("VIDEO_COUNTER_SHARDS", "16")),
+        batch_size=int(os.getenv("VIDEO_COUNTER_BATCH_SIZE", "1000")),
+        flush_interval=float(os.getenv("VIDEO_COUNTER_FLUSH_MS", "1000")) / 1000.0,
+    )
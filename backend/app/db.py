@@ -1,13 +1,98 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from dotenv import load_dotenv
 import os
 
 load_dotenv()
 
-engine = create_engine(os.getenv("SQLALCHEMY_DATABASE_URL"),
-connect_args={"check_same_thread": False})
+DATABASE_URL = os.getenv("SQLALCHEMY_DATABASE_URL")
+
+# Wipe the database on startup and clear seeded data on shutdown (demo mode)
+DB_EPHEMERAL = os.getenv("DB_EPHEMERAL", "false").lower() == "true"
+
+# Applied to every new SQLite connection; tuned for many readers and one writer
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-65536")),  # negative = KiB, so 64 MiB
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "temp_store": "MEMORY",
+}
+
+
+def _engine_kwargs(url) -> dict:
+    kwargs = {"pool_pre_ping": True}
+    if url.get_backend_name() == "sqlite":
+        kwargs["connect_args"] = {"check_same_thread": False}
+        if not url.database or url.database == ":memory:":
+            # In-memory databases use a single shared connection pool
+            return kwargs
+    else:
+        kwargs["pool_recycle"] = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    kwargs["pool_size"] = int(os.getenv("DB_POOL_SIZE", "10"))
+    kwargs["max_overflow"] = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    kwargs["pool_timeout"] = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    return kwargs
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+def create_db_engine(url: str):
+    url = make_url(url)
+    engine = create_engine(url, **_engine_kwargs(url))
+    if url.get_backend_name() == "sqlite":
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+# Async drivers used when ASYNC_SQLALCHEMY_DATABASE_URL is not set explicitly
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+
+def async_database_url(url: str) -> str:
+    url = make_url(url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {url.get_backend_name()!r}")
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def create_async_db_engine(url: str):
+    url = make_url(url)
+    kwargs = _engine_kwargs(url)
+    if "pool_size" in kwargs:
+        # aiosqlite otherwise defaults to NullPool for file databases
+        kwargs["poolclass"] = AsyncAdaptedQueuePool
+    engine = create_async_engine(url, **kwargs)
+    if url.get_backend_name() == "sqlite":
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+def sqlite_path(engine) -> str | None:
+    """Filesystem path of a file-backed SQLite database, else None."""
+    if engine.url.get_backend_name() != "sqlite" or engine.url.database in (None, "", ":memory:"):
+        return None
+    return os.path.abspath(engine.url.database)
+
+
+engine = create_db_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+async_engine = create_async_db_engine(os.getenv("ASYNC_SQLALCHEMY_DATABASE_URL") or async_database_url(DATABASE_URL))
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 def get_db():
@@ -16,3 +101,7 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
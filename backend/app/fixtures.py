@@ -0,0 +1,113 @@
+"""
+Demo seed data and a bulk loader for it.
+
+Rows are inserted with Core `insert()` executemany calls in a single
+transaction instead of one ORM round trip per object.
+"""
+from datetime import datetime
+
+from sqlalchemy import insert, select
+
+from . import models
+
+USERS = [
+    # Bounty creators (do not create videos)
+    dict(handle="PixelPilot", wallet=153.0, total_donations=12.5, time_spent_on_app=98, account_age_days=120, total_interactions=67),
+    dict(handle="FrameFrenzy", wallet=95.0, total_donations=22.0, time_spent_on_app=80, account_age_days=45, total_interactions=101),
+    dict(handle="ClipCrafter", wallet=480.0, total_donations=33.0, time_spent_on_app=175, account_age_days=160, total_interactions=278),
+    dict(handle="MontageMaven", wallet=510.0, total_donations=61.0, time_spent_on_app=140, account_age_days=170, total_interactions=175),
+    dict(handle="VFXValkyrie", wallet=777.0, total_donations=95.0, time_spent_on_app=180, account_age_days=180, total_interactions=388),
+    dict(handle="ViralVisionary", wallet=410.0, total_donations=55.0, time_spent_on_app=150, account_age_days=180, total_interactions=189),
+    dict(handle="RenderRogue", wallet=199.0, total_donations=29.5, time_spent_on_app=50, account_age_days=20, total_interactions=84),
+    # Video creators (no more than 2 videos each)
+    dict(handle="EditEagle", wallet=620.0, total_donations=47.0, time_spent_on_app=60, account_age_days=30, total_interactions=222),
+    dict(handle="JumpCutJedi", wallet=305.0, total_donations=19.0, time_spent_on_app=90, account_age_days=80, total_interactions=110),
+    dict(handle="CodeCrusader", wallet=287.5, total_donations=8.0, time_spent_on_app=110, account_age_days=90, total_interactions=143),
+    dict(handle="MontageMaster", wallet=210.0, total_donations=15.0, time_spent_on_app=70, account_age_days=60, total_interactions=99),
+    dict(handle="VFXVirtuoso", wallet=330.0, total_donations=25.0, time_spent_on_app=120, account_age_days=100, total_interactions=150),
+    dict(handle="PetPrankster", wallet=180.0, total_donations=10.0, time_spent_on_app=40, account_age_days=20, total_interactions=55),
+    dict(handle="SoundSensei", wallet=260.0, total_donations=18.0, time_spent_on_app=80, account_age_days=70, total_interactions=88),
+    dict(handle="MaskMagician", wallet=145.0, total_donations=7.0, time_spent_on_app=35, account_age_days=15, total_interactions=40),
+    dict(handle="TransitionTiger", wallet=175.0, total_donations=12.0, time_spent_on_app=60, account_age_days=25, total_interactions=60),
+]
+
+VIDEOS = [
+    dict(creator_handle="EditEagle", title="Speedrun Editing: 60s Transformation", phash="hash5", length=60, views=120, votes=15, likes=40),
+    dict(creator_handle="EditEagle", title="30 Second Color Grading Tip", phash="hash13", length=30, views=80, votes=10, likes=25),
+    dict(creator_handle="JumpCutJedi", title="Jump Cut Masterclass", phash="hash7", length=54, views=200, votes=22, likes=60),
+    dict(creator_handle="JumpCutJedi", title="Whip Pan Transition Demo", phash="hash15", length=25, views=95, votes=8, likes=30),
+    dict(creator_handle="CodeCrusader", title="Python Animation Challenge", phash="hash2", length=92, views=150, votes=18, likes=50),
+    dict(creator_handle="CodeCrusader", title="Keyboard Macro Setup Fast", phash="hash18", length=44, views=60, votes=5, likes=20),
+    dict(creator_handle="MontageMaster", title="Travel Vlog: 10 Countries in 5 Minutes", phash="hash8", length=120, views=300, votes=30, likes=100),
+    dict(creator_handle="MontageMaster", title="Mountain Hike Timelapse", phash="hash19", length=80, views=110, votes=12, likes=35),
+    dict(creator_handle="VFXVirtuoso", title="VFX Lightning Tutorial", phash="hash10", length=66, views=170, votes=20, likes=55),
+    dict(creator_handle="VFXVirtuoso", title="Particle Explosion Demo", phash="hash20", length=70, views=90, votes=7, likes=28),
+    dict(creator_handle="PetPrankster", title="Best Cat Fails 2025", phash="hash4", length=48, views=250, votes=35, likes=120),
+    dict(creator_handle="PetPrankster", title="Snappy Pet Intro Sequence", phash="hash17", length=36, views=60, votes=6, likes=18),
+    dict(creator_handle="SoundSensei", title="Sound Design Basics in 50s", phash="hash16", length=50, views=130, votes=14, likes=45),
+    dict(creator_handle="SoundSensei", title="Quick Foley Demo", phash="hash21", length=40, views=55, votes=4, likes=15),
+    dict(creator_handle="MaskMagician", title="Quick Masking Trick", phash="hash14", length=28, views=40, votes=3, likes=10),
+    dict(creator_handle="MaskMagician", title="Layer Reveal Animation", phash="hash22", length=32, views=35, votes=2, likes=8),
+    dict(creator_handle="TransitionTiger", title="Whip Pan Transition Demo", phash="hash15", length=25, views=75, votes=9, likes=22),
+    dict(creator_handle="TransitionTiger", title="Spin Cut Example", phash="hash23", length=29, views=50, votes=5, likes=14),
+]
+
+BOUNTIES = [
+    dict(description="Create a montage of drone footage with at least 3 different locations.", creator_handle="PixelPilot", prize_pool=75.0, cutoff_date=datetime(2025, 9, 10), judging_start=datetime(2025, 9, 11), judging_end=datetime(2025, 9, 18), is_closed=False, following=False),
+    dict(description="Edit a video showing a creative use of slow motion in sports.", creator_handle="FrameFrenzy", prize_pool=60.0, cutoff_date=datetime(2025, 9, 15), judging_start=datetime(2025, 9, 16), judging_end=datetime(2025, 9, 22), is_closed=False, following=False),
+    dict(description="Produce a tutorial for beginners on setting up a home video studio.", creator_handle="ClipCrafter", prize_pool=80.0, cutoff_date=datetime(2025, 9, 20), judging_start=datetime(2025, 9, 21), judging_end=datetime(2025, 9, 28), is_closed=False, following=False),
+    dict(description="Make a travel vlog covering at least 5 countries in under 5 minutes.", creator_handle="MontageMaven", prize_pool=120.0, cutoff_date=datetime(2025, 9, 25), judging_start=datetime(2025, 9, 26), judging_end=datetime(2025, 10, 2), is_closed=False, following=False),
+    dict(description="Show off your best VFX lightning effect in a short clip.", creator_handle="VFXValkyrie", prize_pool=90.0, cutoff_date=datetime(2025, 9, 30), judging_start=datetime(2025, 10, 1), judging_end=datetime(2025, 10, 7), is_closed=False, following=False),
+    dict(description="Create a compilation of funny pet fails with creative editing.", creator_handle="ViralVisionary", prize_pool=55.0, cutoff_date=datetime(2025, 9, 12), judging_start=datetime(2025, 9, 13), judging_end=datetime(2025, 9, 19), is_closed=False, following=False),
+    dict(description="Explain a technical concept visually using animation or graphics.", creator_handle="RenderRogue", prize_pool=70.0, cutoff_date=datetime(2025, 9, 18), judging_start=datetime(2025, 9, 19), judging_end=datetime(2025, 9, 25), is_closed=False, following=False),
+]
+
+# (bounty description, creator handle, video title)
+SUBMISSIONS = [
+    # Drone montage bounty (using existing videos)
+    ("Create a montage of drone footage with at least 3 different locations.", "EditEagle", "Speedrun Editing: 60s Transformation"),
+    ("Create a montage of drone footage with at least 3 different locations.", "MontageMaster", "Travel Vlog: 10 Countries in 5 Minutes"),
+    # Slow motion sports bounty
+    ("Edit a video showing a creative use of slow motion in sports.", "JumpCutJedi", "Jump Cut Masterclass"),
+    ("Edit a video showing a creative use of slow motion in sports.", "TransitionTiger", "Whip Pan Transition Demo"),
+    # Home studio bounty
+    ("Produce a tutorial for beginners on setting up a home video studio.", "CodeCrusader", "Python Animation Challenge"),
+    ("Produce a tutorial for beginners on setting up a home video studio.", "SoundSensei", "Sound Design Basics in 50s"),
+    # Travel vlog bounty
+    ("Make a travel vlog covering at least 5 countries in under 5 minutes.", "MontageMaster", "Mountain Hike Timelapse"),
+    # VFX lightning bounty
+    ("Show off your best VFX lightning effect in a short clip.", "VFXVirtuoso", "VFX Lightning Tutorial"),
+    ("Show off your best VFX lightning effect in a short clip.", "VFXVirtuoso", "Particle Explosion Demo"),
+    # Pet fails bounty
+    ("Create a compilation of funny pet fails with creative editing.", "PetPrankster", "Best Cat Fails 2025"),
+    ("Create a compilation of funny pet fails with creative editing.", "PetPrankster", "Snappy Pet Intro Sequence"),
+    # Technical animation bounty
+    ("Explain a technical concept visually using animation or graphics.", "CodeCrusader", "Keyboard Macro Setup Fast"),
+    ("Explain a technical concept visually using animation or graphics.", "MaskMagician", "Quick Masking Trick"),
+]
+
+
+def load_fixtures(engine) -> bool:
+    """Seed the demo data into an empty database. Returns False if users already exist."""
+    with engine.begin() as conn:
+        if conn.execute(select(models.User.handle).limit(1)).first() is not None:
+            return False
+        # The seeded totals predate any session event, so they are also the rollup baseline
+        conn.execute(insert(models.User), [
+            dict(user, base_time_spent_on_app=user["time_spent_on_app"], base_total_interactions=user["total_interactions"],
+                 base_total_donations=user["total_donations"])
+            for user in USERS
+        ])
+        conn.execute(insert(models.Video), VIDEOS)
+        conn.execute(insert(models.Bounty), BOUNTIES)
+        # Two creators share a video title, so key videos by (creator, title)
+        video_ids = {
+            (creator, title): video_id
+            for creator, title, video_id in conn.execute(select(models.Video.creator_handle, models.Video.title, models.Video.id))
+        }
+        bounty_ids = dict(conn.execute(select(models.Bounty.description, models.Bounty.id)).all())
+        conn.execute(insert(models.BountySubmission), [
+            {"bounty_id": bounty_ids[description], "creator_handle": handle, "video_id": video_ids[(handle, title)]}
+            for description, handle, title in SUBMISSIONS
+        ])
+    return True
@@ -0,0 +1,149 @@
+import os
+from concurrent.futures import Future
+from typing import NamedTuple
+
+import numpy as np
+
+from .batching import MicroBatcher
+from .cache import LRUCache
+from .velocity import VELOCITY_FEATURES
+from . import models
+
+
+class BatchScorer(MicroBatcher):
+    """
+    Micro-batching wrapper around the fraud detection model's `predict`.
+
+    Concurrent callers submit one feature row each; the worker thread
+    stacks a batch of rows into a single NumPy matrix and calls `predict`
+    once per batch.
+    """
+
+    thread_name = "fraud-batch-scorer"
+
+    def __init__(self, predict, max_batch_size: int = 64, max_wait: float = 0.005):
+        super().__init__(max_batch_size, max_wait)
+        self.predict = predict
+
+    def submit(self, features) -> Future:
+        return self._enqueue(features)
+
+    def score(self, features) -> bool:
+        """Score a single feature row, batched with any concurrent callers."""
+        return self.submit(features).result()
+
+    def score_many(self, rows) -> list[bool]:
+        """Score an already collected set of rows with one `predict` call."""
+        if len(rows) == 0:
+            return []
+        preds = self.predict(np.asarray(rows, dtype=np.float64))
+        return [bool(p) for p in preds]
+
+    def _process(self, items: list) -> list:
+        return self.score_many(items)
+
+
+class ViewerFeatures(NamedTuple):
+    total_interactions: int
+    total_donations: float
+    time_spent_on_app: int
+    account_age_days: int
+    viewer_handle: str | None = None
+
+
+class ViewerFeatureStore:
+    """
+    Caches the per-viewer features the fraud model needs, plus the
+    session id -> viewer handle mapping, so a fraud check costs at most one
+    indexed read. Entries are evicted LRU-first and after `ttl` seconds.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 60.0):
+        self._sessions = LRUCache(maxsize=maxsize, ttl=ttl)
+        self._viewers = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, db, session_id: int) -> ViewerFeatures | None:
+        handle = self._sessions.get(session_id)
+        if handle is not None:
+            features = self._viewers.get(handle)
+            if features is not None:
+                return features
+            row = (
+                db.query(*_FEATURE_COLUMNS)
+                .filter(models.User.handle == handle)
+                .first()
+            )
+        else:
+            row = (
+                db.query(models.Session.viewer_handle, *_FEATURE_COLUMNS)
+                .join(models.User, models.User.handle == models.Session.viewer_handle)
+                .filter(models.Session.id == session_id)
+                .first()
+            )
+            if row is None:
+                return None
+            handle, row = row[0], row[1:]
+            self._sessions.set(session_id, handle)
+        if row is None:
+            return None
+        features = ViewerFeatures(*row, viewer_handle=handle)
+        self._viewers.set(handle, features)
+        return features
+
+    def invalidate(self, viewer_handle: str):
+        """Drop cached features after the viewer's totals change."""
+        self._viewers.pop(viewer_handle)
+
+    def clear(self):
+        self._sessions.clear()
+        self._viewers.clear()
+
+
+_FEATURE_COLUMNS = (
+    models.User.total_interactions,
+    models.User.total_donations,
+    models.User.time_spent_on_app,
+    models.User.account_age_days,
+)
+
+
+BASE_FEATURES = (
+    "seconds_watched",
+    "interactions",
+    "total_interactions",
+    "donation_amount",
+    "total_donations",
+    "time_spent_on_app",
+    "account_age_days",
+)
+# Models trained on only the base columns are served the leading slice of this row
+FEATURE_NAMES = BASE_FEATURES + VELOCITY_FEATURES
+
+
+def build_features(ev, viewer, velocity) -> list:
+    """Feature row in FEATURE_NAMES order, shared by serving and the training export."""
+    return [
+        ev.seconds_watched,
+        ev.interactions,
+        viewer.total_interactions,
+        ev.donation_amount,
+        viewer.total_donations,
+        viewer.time_spent_on_app,
+        viewer.account_age_days,
+        *velocity,
+    ]
+
+
+def create_scorer(predict) -> BatchScorer:
+    return BatchScorer(
+        predict,
+        max_batch_size=int(os.getenv("FRAUD_BATCH_MAX_SIZE", "64")),
+        max_wait=float(os.getenv("FRAUD_BATCH_WINDOW_MS", "5")) / 1000.0,
+    )
+
+
+def create_feature_store() -> ViewerFeatureStore:
+    return ViewerFeatureStore(
+        maxsize=int(os.getenv("FRAUD_FEATURE_CACHE_SIZE", "10000")),
+        ttl=float(os.getenv("FRAUD_FEATURE_CACHE_TTL", "60")),
+    )
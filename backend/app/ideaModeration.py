@@ -1,14 +1,24 @@
+import asyncio
+import hashlib
+import time
 import requests
 import os
 import json
+import httpx
 from dotenv import load_dotenv
+from .cache import LRUCache
+from . import metrics
+
+REQUEST_TIMEOUT = float(os.getenv("IDEA_MODERATION_TIMEOUT", "10"))
+
+_session = requests.Session()
 
 def moderate_idea(video_idea: str) -> dict:
     url = os.getenv("IDEA_MODERATION_URL") + "/duuck/moderate_idea"
     payload = {
         "video_idea": video_idea
     }
-    response = requests.post(url, json=payload).json()
+    response = _session.post(url, json=payload, timeout=REQUEST_TIMEOUT).json()
     return json.loads(response)
 
 def find_similar_idea(video_idea: str, database_ideas: list[str]) -> dict:
@@ -17,9 +27,77 @@ def find_similar_idea(video_idea: str, database_ideas: list[str]) -> dict:
         "video_idea": video_idea,
         "database_ideas": database_ideas
     }
-    response = requests.post(url, json=payload).json()
+    response = _session.post(url, json=payload, timeout=REQUEST_TIMEOUT).json()
     return json.loads(response)
 
+
+class ModerationClient:
+    """
+    Async client for the idea moderation service.
+
+    Requests share one pooled `httpx.AsyncClient`, at most `max_concurrency`
+    calls are in flight at once, and results are cached by a hash of the
+    request payload so resubmitted descriptions skip the network.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        timeout: float = REQUEST_TIMEOUT,
+        max_connections: int = 20,
+        max_concurrency: int = 10,
+        cache_size: int = 1024,
+        cache_ttl: float | None = 3600.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self.transport = transport
+        self.cache = LRUCache(maxsize=cache_size, ttl=cache_ttl)
+        self._client = None
+        self._semaphore = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url or os.getenv("IDEA_MODERATION_URL"),
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+                transport=self.transport,
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def _post(self, path: str, payload: dict) -> dict:
+        key = hashlib.sha256((path + json.dumps(payload, sort_keys=True)).encode()).hexdigest()
+        cached = self.cache.get(key)
+        if cached is not None:
+            metrics.MODERATION_CACHE.inc(path, "hit")
+            return cached
+        metrics.MODERATION_CACHE.inc(path, "miss")
+        client = self._get_client()
+        async with self._semaphore:
+            start = time.perf_counter()
+            response = await client.post(path, json=payload)
+            metrics.MODERATION_SECONDS.observe(time.perf_counter() - start, path)
+        response.raise_for_status()
+        result = json.loads(response.json())
+        self.cache.set(key, result)
+        return result
+
+    async def moderate_idea(self, video_idea: str) -> dict:
+        return await self._post("/duuck/moderate_idea", {"video_idea": video_idea})
+
+    async def find_similar_idea(self, video_idea: str, database_ideas: list[str]) -> dict:
+        return await self._post("/duuck/similar_idea", {"video_idea": video_idea, "database_ideas": database_ideas})
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
 # Example usage
 if __name__ == "__main__":
     load_dotenv()
@@ -0,0 +1,109 @@
+import os
+import threading
+
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+
+from . import models
+
+
+class SessionEventWriter:
+    """
+    Write-behind buffer for session events.
+
+    Handlers enqueue fully scored rows and return immediately; a background
+    thread bulk-inserts the buffer in one transaction once `batch_size` rows
+    are pending or every `flush_interval` seconds, whichever comes first.
+    """
+
+    def __init__(self, engine, batch_size: int = 500, flush_interval: float = 0.5, max_pending: int = 100000):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="session-event-writer", daemon=True)
+            self._thread.start()
+
+    def enqueue(self, rows: list[dict]) -> bool:
+        """
+        Buffer rows for the background writer. Returns True once
+        `max_pending` rows are buffered; the caller should then apply
+        backpressure by calling `flush` itself (off the event loop) rather
+        than let the buffer grow without bound.
+        """
+        with self._lock:
+            self._buffer.extend(rows)
+            pending = len(self._buffer)
+        if pending >= self.batch_size:
+            self._wake.set()
+        return pending >= self.max_pending
+
+    def flush(self) -> int:
+        """Insert everything buffered so far. Returns the number of rows written."""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+            if not rows:
+                return 0
+            # A failing chunk is split in halves until the rows that can never be
+            # inserted (e.g. a foreign key violation) are isolated and dropped
+            pending = [rows]
+            written = 0
+            while pending:
+                chunk = pending.pop()
+                try:
+                    with self.engine.begin() as conn:
+                        conn.execute(insert(models.SessionEvent), chunk)
+                except OperationalError as e:
+                    # Locked or unreachable database: keep everything not yet written for the next flush
+                    left = chunk + [row for part in reversed(pending) for row in part]
+                    print(f"Error flushing {len(left)} session events, will retry: {e}")
+                    with self._lock:
+                        self._buffer[:0] = left
+                    return written
+                except SQLAlchemyError as e:
+                    if len(chunk) == 1:
+                        print(f"Error writing session event, dropping it: {chunk[0]}: {e}")
+                        continue
+                    mid = len(chunk) // 2
+                    pending += [chunk[mid:], chunk[:mid]]
+                    continue
+                written += len(chunk)
+            return written
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def close(self):
+        """Stop the flusher and write out anything still buffered."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def __len__(self):
+        return len(self._buffer)
+
+
+def create_event_writer(engine) -> SessionEventWriter:
+    return SessionEventWriter(
+        engine,
+        batch_size=int(os.getenv("SESSION_EVENT_BATCH_SIZE", "500")),
+        flush_interval=float(os.getenv("SESSION_EVENT_FLUSH_MS", "500")) / 1000.0,
+        max_pending=int(os.getenv("SESSION_EVENT_MAX_PENDING", "100000")),
+    )
@@ -0,0 +1,131 @@
+import base64
+import os
+import threading
+import time
+from bisect import bisect_right, insort
+
+
+class BountyLeaderboard:
+    """
+    Bounty ids kept sorted by prize pool (highest first, ties by id).
+
+    Contributions update a single entry in O(log n) search plus a list
+    shift, so a page is a slice of the precomputed ranking rather than a
+    sort over the whole bounty table.
+
+    Other workers and bulk imports change bounties behind this process's
+    back, so the ranking is reconciled with the database every
+    `refresh_interval` seconds (see `refresh_due` and `refresh`).
+    """
+
+    def __init__(self, refresh_interval: float | None = 5.0):
+        self.refresh_interval = refresh_interval
+        self._ranking = []  # sorted (-prize_pool, bounty_id)
+        self._scores = {}
+        self._refreshed_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def load(self, rows):
+        """Replace the ranking with (bounty_id, prize_pool) rows."""
+        with self._lock:
+            self._scores = {bounty_id: prize_pool or 0.0 for bounty_id, prize_pool in rows}
+            self._ranking = sorted((-score, bounty_id) for bounty_id, score in self._scores.items())
+            self._refreshed_at = time.monotonic()
+
+    def update(self, bounty_id: int, prize_pool: float, only_increase: bool = False) -> bool:
+        """
+        Set a bounty's prize pool. With `only_increase`, a value lower than
+        the stored one is ignored; contributions only ever grow a pool, so
+        a smaller value is a stale read that finished late. Returns whether
+        the ranking changed.
+        """
+        prize_pool = prize_pool or 0.0
+        with self._lock:
+            return self._set(bounty_id, prize_pool, only_increase)
+
+    def _set(self, bounty_id: int, prize_pool: float, only_increase: bool) -> bool:
+        old = self._scores.get(bounty_id)
+        if old is not None:
+            if old == prize_pool or (only_increase and prize_pool < old):
+                return False
+            self._discard((-old, bounty_id))
+        self._scores[bounty_id] = prize_pool
+        insort(self._ranking, (-prize_pool, bounty_id))
+        return True
+
+    def refresh_due(self) -> bool:
+        """True once per `refresh_interval`; the caller that gets True should call `refresh`."""
+        if self.refresh_interval is None:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            if now - self._refreshed_at < self.refresh_interval:
+                return False
+            self._refreshed_at = now
+            return True
+
+    def refresh(self, rows) -> bool:
+        """
+        Merge (bounty_id, prize_pool) rows read from the database: add
+        bounties this process has not seen and raise pools that grew
+        elsewhere. Pools are never lowered, so a contribution applied here
+        after the rows were read is not lost. Returns whether anything changed.
+        """
+        changed = False
+        with self._lock:
+            for bounty_id, prize_pool in rows:
+                changed |= self._set(bounty_id, prize_pool or 0.0, only_increase=True)
+        return changed
+
+    def remove(self, bounty_id: int):
+        with self._lock:
+            old = self._scores.pop(bounty_id, None)
+            if old is not None:
+                self._discard((-old, bounty_id))
+
+    def _discard(self, key):
+        i = bisect_right(self._ranking, key) - 1
+        if i >= 0 and self._ranking[i] == key:
+            del self._ranking[i]
+
+    def page(self, limit: int, offset: int = 0, cursor: str | None = None) -> tuple[list[int], str | None]:
+        """
+        Return a page of bounty ids and the cursor for the next page.
+        A cursor takes precedence over `offset` and stays stable when
+        bounties above it change rank.
+        """
+        with self._lock:
+            start = offset
+            if cursor is not None:
+                start = bisect_right(self._ranking, decode_cursor(cursor)) + offset
+            entries = self._ranking[start:start + limit]
+            has_more = start + limit < len(self._ranking)
+        ids = [bounty_id for _, bounty_id in entries]
+        next_cursor = encode_cursor(entries[-1]) if entries and has_more else None
+        return ids, next_cursor
+
+    def clear(self):
+        with self._lock:
+            self._ranking = []
+            self._scores = {}
+
+    def __len__(self):
+        return len(self._ranking)
+
+
+def create_leaderboard() -> BountyLeaderboard:
+    interval = float(os.getenv("LEADERBOARD_REFRESH_SECONDS", "5"))
+    return BountyLeaderboard(refresh_interval=interval if interval > 0 else None)
+
+
+def encode_cursor(key) -> str:
+    neg_score, bounty_id = key
+    return base64.urlsafe_b64encode(f"{-neg_score!r}:{bounty_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    try:
+        score, bounty_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        return (-float(score), int(bounty_id))
+    except ValueError:
+        raise ValueError("Invalid cursor")
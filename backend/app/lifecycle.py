@@ -0,0 +1,194 @@
+import heapq
+import os
+import threading
+from datetime import datetime
+from typing import NamedTuple
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from . import models
+from .voting import close_bounty
+
+OPEN = "open"
+SUBMISSIONS_CLOSED = "submissions_closed"
+JUDGING = "judging"
+AWAITING_PAYOUT = "awaiting_payout"
+CLOSED = "closed"
+PHASES = (OPEN, SUBMISSIONS_CLOSED, JUDGING, AWAITING_PAYOUT, CLOSED)
+
+
+class BountySchedule(NamedTuple):
+    creator_handle: str
+    cutoff_date: datetime
+    judging_start: datetime
+    judging_end: datetime
+    is_closed: bool
+
+    def phase(self, now: datetime | None = None) -> str:
+        if self.is_closed:
+            return CLOSED
+        now = now or datetime.now()
+        if now <= self.cutoff_date:
+            return OPEN
+        if now < self.judging_start:
+            return SUBMISSIONS_CLOSED
+        if now <= self.judging_end:
+            return JUDGING
+        return AWAITING_PAYOUT
+
+
+class BountyScheduler:
+    """
+    Drives bounties through their lifecycle as deadlines pass.
+
+    Each bounty's dates are cached so request handlers can gate on its
+    phase without reading the row. Upcoming cutoff / judging deadlines sit
+    in a min-heap; a background thread sleeps until the earliest one,
+    notifies listeners of the phase change and closes bounties whose
+    judging has ended, paying out up to `batch_size` of them per
+    transaction.
+    """
+
+    def __init__(self, engine, batch_size: int = 50, max_sleep: float = 60.0, enabled: bool = True):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.max_sleep = max_sleep
+        self.enabled = enabled
+        self._schedules = {}
+        self._heap = []  # (deadline, bounty_id)
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add_listener(self, callback):
+        """Register `callback(bounty_id, phase)`, called from the scheduler thread."""
+        self._listeners.append(callback)
+
+    def track(self, bounty: models.Bounty) -> BountySchedule:
+        schedule = BountySchedule(
+            bounty.creator_handle, bounty.cutoff_date, bounty.judging_start, bounty.judging_end, bool(bounty.is_closed)
+        )
+        now = datetime.now()
+        with self._lock:
+            self._schedules[bounty.id] = schedule
+            if not schedule.is_closed:
+                for deadline in (schedule.cutoff_date, schedule.judging_start, schedule.judging_end):
+                    if deadline is not None and deadline >= now:
+                        heapq.heappush(self._heap, (deadline, bounty.id))
+                if schedule.judging_end is not None and schedule.judging_end < now:
+                    # Overdue: pay out on the next pass
+                    heapq.heappush(self._heap, (now, bounty.id))
+        self._wake.set()
+        return schedule
+
+    def load(self, bounties):
+        for bounty in bounties:
+            self.track(bounty)
+
+    def get(self, bounty_id: int) -> BountySchedule | None:
+        return self._schedules.get(bounty_id)
+
+    def phase(self, bounty_id: int) -> str | None:
+        schedule = self._schedules.get(bounty_id)
+        return schedule.phase() if schedule is not None else None
+
+    def mark_closed(self, bounty_id: int):
+        with self._lock:
+            schedule = self._schedules.get(bounty_id)
+            if schedule is not None:
+                self._schedules[bounty_id] = schedule._replace(is_closed=True)
+
+    def _due(self, now: datetime) -> list[int]:
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, bounty_id = heapq.heappop(self._heap)
+                if bounty_id not in due:
+                    due.append(bounty_id)
+        return due
+
+    def _notify(self, bounty_id: int, phase: str):
+        for callback in self._listeners:
+            try:
+                callback(bounty_id, phase)
+            except Exception as e:
+                print(f"Error in lifecycle listener for bounty {bounty_id}: {e}")
+
+    def run_due(self, now: datetime | None = None) -> int:
+        """Process every deadline that has passed. Returns the number of bounties paid out."""
+        now = now or datetime.now()
+        to_close = []
+        for bounty_id in self._due(now):
+            schedule = self._schedules.get(bounty_id)
+            if schedule is None or schedule.is_closed:
+                continue
+            phase = schedule.phase(now)
+            if phase == AWAITING_PAYOUT:
+                to_close.append(bounty_id)
+            else:
+                self._notify(bounty_id, phase)
+        paid = 0
+        for i in range(0, len(to_close), self.batch_size):
+            paid += self._payout(to_close[i:i + self.batch_size])
+        return paid
+
+    def _payout(self, bounty_ids: list[int]) -> int:
+        try:
+            with Session(self.engine) as db:
+                bounties = db.query(models.Bounty).filter(models.Bounty.id.in_(bounty_ids)).all()
+                closed = [bounty.id for bounty in bounties if close_bounty(db, bounty) is not None]
+                db.commit()
+        except SQLAlchemyError as e:
+            print(f"Error paying out bounties {bounty_ids}, will retry: {e}")
+            retry_at = datetime.now()
+            with self._lock:
+                for bounty_id in bounty_ids:
+                    heapq.heappush(self._heap, (retry_at, bounty_id))
+            return 0
+        for bounty_id in bounty_ids:
+            # Bounties closed elsewhere (e.g. /distribute) are just marked
+            self.mark_closed(bounty_id)
+        for bounty_id in closed:
+            self._notify(bounty_id, CLOSED)
+        return len(closed)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.run_due()
+            with self._lock:
+                next_deadline = self._heap[0][0] if self._heap else None
+            timeout = self.max_sleep
+            if next_deadline is not None:
+                timeout = min(timeout, max((next_deadline - datetime.now()).total_seconds(), 0.0))
+            self._wake.wait(timeout)
+            self._wake.clear()
+
+    def start(self):
+        if self.enabled and (self._thread is None or not self._thread.is_alive()):
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="bounty-scheduler", daemon=True)
+            self._thread.start()
+
+    def close(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def clear(self):
+        with self._lock:
+            self._schedules.clear()
+            self._heap.clear()
+
+
+def create_bounty_scheduler(engine) -> BountyScheduler:
+    return BountyScheduler(
+        engine,
+        batch_size=int(os.getenv("BOUNTY_PAYOUT_BATCH_SIZE", "50")),
+        max_sleep=float(os.getenv("BOUNTY_SCHEDULER_MAX_SLEEP", "60")),
+        enabled=os.getenv("BOUNTY_SCHEDULER_ENABLED", "true").lower() == "true",
+    )
@@ -1,147 +1,182 @@
 from fastapi import Query
-import joblib
 import os
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Request, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError, StatementError
 from datetime import datetime
-from .db import Base, engine, get_db
+from .db import DB_EPHEMERAL, Base, async_engine, engine, get_async_db, get_db, sqlite_path
 from . import models, schemas
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from .models import Bounty, BountyContribution, BountySubmission, BountyVote, User, BountyFollow
 from .schemas import BountyCreate, BountyOut, UserCreate
-from .ideaModeration import find_similar_idea,moderate_idea
-from collections import Counter
-
-
-# Delete and recreate the database file at startup
-db_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "duuck.db")
-if os.path.exists(db_path):
-    os.remove(db_path)
-Base.metadata.create_all(bind=engine)
-
-# Load the fraud detection model
-fraud_model = joblib.load("models/fraud_detection_model.pkl")
+from .ideaModeration import ModerationClient
+from .similarity import create_similarity_index
+from .leaderboard import create_leaderboard
+from .bounty_feed import load_bounty_feed
+from .ingest import create_event_writer
+from .contributions import ContributionError, contribute, create_contribution_batcher
+from .voting import close_bounty, get_winners, record_vote, winner_dict
+from .lifecycle import AWAITING_PAYOUT, CLOSED, JUDGING, OPEN, create_bounty_scheduler
+from .fraud import build_features, create_feature_store, create_scorer
+from .model_registry import create_model_registry
+from .fixtures import load_fixtures
+from .migrations import upgrade_schema_from_env
+from .voting_feed import create_voting_feed
+from .notifications import create_notification_dispatcher, get_inbox
+from .response_cache import create_response_cache, etag_for, etag_matches
+from .bulk import FORMATS, export_rows, format_rows, get_model, import_rows, iter_lines, parse_rows
+from .phash_index import create_phash_index
+from .counters import create_counter_buffer
+from .rollups import SECONDS_PER_APP_MINUTE, create_event_rollup
+from .velocity import create_velocity_tracker
+from . import metrics
+import asyncio
+import json
+import anyio
+import httpx
+
+
+# Seed the demo users, videos and bounties into an empty database
+SEED_DEMO_DATA = os.getenv("SEED_DEMO_DATA", "true").lower() == "true"
+
+# The fraud model loads in the background at startup (or on first use) and hot-swaps when a new .pkl lands
+fraud_models = create_model_registry()
+fraud_scorer = create_scorer(fraud_models.predict)
+viewer_features = create_feature_store()
+# Per-viewer and per-video burst counters fed into the fraud feature row
+velocity_tracker = create_velocity_tracker()
+moderation = ModerationClient()
+similarity_index = create_similarity_index()
+# Bounties scoring below this cosine similarity are never sent to the remote check
+SIMILARITY_THRESHOLD = float(os.getenv("SIMILARITY_THRESHOLD", "0.5"))
+SIMILARITY_TOP_K = int(os.getenv("SIMILARITY_TOP_K", "5"))
+# Reconciled with the bounties table every LEADERBOARD_REFRESH_SECONDS for changes made by other workers
+leaderboard = create_leaderboard()
+# Session events are acknowledged once scored and bulk-inserted in the background
+SESSION_EVENT_WRITE_BEHIND = os.getenv("SESSION_EVENT_WRITE_BEHIND", "true").lower() == "true"
+event_writer = create_event_writer(engine)
+contribution_batcher = create_contribution_batcher(engine)
+voting_feed = create_voting_feed()
+# Near-duplicate lookup over Video.phash; duplicate bounty submissions are rejected
+phash_index = create_phash_index()
+# View/like/vote increments are summed in memory and flushed to the videos table periodically
+video_counters = create_counter_buffer(engine)
+# Keeps User/Video watch time, interaction and donation totals current as events arrive
+event_rollup = create_event_rollup(engine)
+# Closes and pays out bounties as judging ends; also caches each bounty's phase for the gate checks
+bounty_scheduler = create_bounty_scheduler(engine)
+# Cached GET payloads for bounties, videos and winners; mutating endpoints invalidate them
+response_cache = create_response_cache()
+video_counters.add_listener(lambda video_ids: [response_cache.invalidate_video(video_id) for video_id in video_ids])
+
+def _on_bounty_phase(bounty_id: int, phase: str):
+    if phase == CLOSED:
+        similarity_index.remove(bounty_id)
+        response_cache.invalidate_bounty(bounty_id)
+
+bounty_scheduler.add_listener(_on_bounty_phase)
+# Phase changes are fanned out to follower inboxes in the background
+notifications = create_notification_dispatcher(engine)
+bounty_scheduler.add_listener(notifications.publish)
+
+def _bounty_schedule(db: Session, bounty_id: int):
+    schedule = bounty_scheduler.get(bounty_id)
+    if schedule is None:
+        bounty = db.get(Bounty, bounty_id)
+        if bounty:
+            schedule = bounty_scheduler.track(bounty)
+    return schedule
+
+def warm_indexes(db: Session):
+    """(Re)load the in-memory indexes from the database."""
+    # Embedding imports scikit-learn (about a second), so the similarity index fills in the background
+    similarity_index.add_many_in_background(
+        db.query(models.Bounty.id, models.Bounty.description).filter(models.Bounty.is_closed == False)
+    )
+    leaderboard.load(db.query(models.Bounty.id, models.Bounty.prize_pool))
+    phash_index.add_many(db.query(models.Video.id, models.Video.phash, models.Video.creator_handle))
+    bounty_scheduler.load(db.query(models.Bounty))
+    voting_feed.clear()
+    response_cache.clear()
+
+def init_data():
+    """Create tables, load fixtures and warm the in-memory indexes."""
+    # Only wipe the database when running in ephemeral (demo) mode
+    db_path = sqlite_path(engine)
+    if DB_EPHEMERAL and db_path:
+        engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+    Base.metadata.create_all(bind=engine)
+    # create_all never alters existing tables; add columns and indexes from newer models
+    upgrade_schema_from_env(engine)
+    try:
+        if SEED_DEMO_DATA:
+            load_fixtures(engine)
+        with Session(engine) as db:
+            warm_indexes(db)
+    except SQLAlchemyError as e:
+        print(f"Error during startup data initialization: {e}")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Lifespan context manager to load initial data and clean up resources. 
     """
-    with Session(engine) as db:
-        try:
-            # Example: Add initial users
-            if not db.query(models.User).first():
-                users = [
-                    # Bounty creators (do not create videos)
-                    models.User(handle="PixelPilot", wallet=153.0, total_donations=12.5, time_spent_on_app=98, account_age_days=120, total_interactions=67),
-                    models.User(handle="FrameFrenzy", wallet=95.0, total_donations=22.0, time_spent_on_app=80, account_age_days=45, total_interactions=101),
-                    models.User(handle="ClipCrafter", wallet=480.0, total_donations=33.0, time_spent_on_app=175, account_age_days=160, total_interactions=278),
-                    models.User(handle="MontageMaven", wallet=510.0, total_donations=61.0, time_spent_on_app=140, account_age_days=170, total_interactions=175),
-                    models.User(handle="VFXValkyrie", wallet=777.0, total_donations=95.0, time_spent_on_app=180, account_age_days=180, total_interactions=388),
-                    models.User(handle="ViralVisionary", wallet=410.0, total_donations=55.0, time_spent_on_app=150, account_age_days=180, total_interactions=189),
-                    models.User(handle="RenderRogue", wallet=199.0, total_donations=29.5, time_spent_on_app=50, account_age_days=20, total_interactions=84),
-                    # Video creators (no more than 2 videos each)
-                    models.User(handle="EditEagle", wallet=620.0, total_donations=47.0, time_spent_on_app=60, account_age_days=30, total_interactions=222),
-                    models.User(handle="JumpCutJedi", wallet=305.0, total_donations=19.0, time_spent_on_app=90, account_age_days=80, total_interactions=110),
-                    models.User(handle="CodeCrusader", wallet=287.5, total_donations=8.0, time_spent_on_app=110, account_age_days=90, total_interactions=143),
-                    models.User(handle="MontageMaster", wallet=210.0, total_donations=15.0, time_spent_on_app=70, account_age_days=60, total_interactions=99),
-                    models.User(handle="VFXVirtuoso", wallet=330.0, total_donations=25.0, time_spent_on_app=120, account_age_days=100, total_interactions=150),
-                    models.User(handle="PetPrankster", wallet=180.0, total_donations=10.0, time_spent_on_app=40, account_age_days=20, total_interactions=55),
-                    models.User(handle="SoundSensei", wallet=260.0, total_donations=18.0, time_spent_on_app=80, account_age_days=70, total_interactions=88),
-                    models.User(handle="MaskMagician", wallet=145.0, total_donations=7.0, time_spent_on_app=35, account_age_days=15, total_interactions=40),
-                    models.User(handle="TransitionTiger", wallet=175.0, total_donations=12.0, time_spent_on_app=60, account_age_days=25, total_interactions=60),
-                ]
-                db.add_all(users)
-                db.commit()
-
-            if not db.query(models.Video).first():
-                videos = [
-                    models.Video(creator_handle="EditEagle", title="Speedrun Editing: 60s Transformation", phash="hash5", length=60, views=120, votes=15, likes=40),
-                    models.Video(creator_handle="EditEagle", title="30 Second Color Grading Tip", phash="hash13", length=30, views=80, votes=10, likes=25),
-                    models.Video(creator_handle="JumpCutJedi", title="Jump Cut Masterclass", phash="hash7", length=54, views=200, votes=22, likes=60),
-                    models.Video(creator_handle="JumpCutJedi", title="Whip Pan Transition Demo", phash="hash15", length=25, views=95, votes=8, likes=30),
-                    models.Video(creator_handle="CodeCrusader", title="Python Animation Challenge", phash="hash2", length=92, views=150, votes=18, likes=50),
-                    models.Video(creator_handle="CodeCrusader", title="Keyboard Macro Setup Fast", phash="hash18", length=44, views=60, votes=5, likes=20),
-                    models.Video(creator_handle="MontageMaster", title="Travel Vlog: 10 Countries in 5 Minutes", phash="hash8", length=120, views=300, votes=30, likes=100),
-                    models.Video(creator_handle="MontageMaster", title="Mountain Hike Timelapse", phash="hash19", length=80, views=110, votes=12, likes=35),
-                    models.Video(creator_handle="VFXVirtuoso", title="VFX Lightning Tutorial", phash="hash10", length=66, views=170, votes=20, likes=55),
-                    models.Video(creator_handle="VFXVirtuoso", title="Particle Explosion Demo", phash="hash20", length=70, views=90, votes=7, likes=28),
-                    models.Video(creator_handle="PetPrankster", title="Best Cat Fails 2025", phash="hash4", length=48, views=250, votes=35, likes=120),
-                    models.Video(creator_handle="PetPrankster", title="Snappy Pet Intro Sequence", phash="hash17", length=36, views=60, votes=6, likes=18),
-                    models.Video(creator_handle="SoundSensei", title="Sound Design Basics in 50s", phash="hash16", length=50, views=130, votes=14, likes=45),
-                    models.Video(creator_handle="SoundSensei", title="Quick Foley Demo", phash="hash21", length=40, views=55, votes=4, likes=15),
-                    models.Video(creator_handle="MaskMagician", title="Quick Masking Trick", phash="hash14", length=28, views=40, votes=3, likes=10),
-                    models.Video(creator_handle="MaskMagician", title="Layer Reveal Animation", phash="hash22", length=32, views=35, votes=2, likes=8),
-                    models.Video(creator_handle="TransitionTiger", title="Whip Pan Transition Demo", phash="hash15", length=25, views=75, votes=9, likes=22),
-                    models.Video(creator_handle="TransitionTiger", title="Spin Cut Example", phash="hash23", length=29, views=50, votes=5, likes=14),
-                ]
-                db.add_all(videos)
-                db.commit()
-
-            if not db.query(models.Bounty).first():
-                bounties = [
-                    models.Bounty(description="Create a montage of drone footage with at least 3 different locations.", creator_handle="PixelPilot", prize_pool=75.0, cutoff_date=datetime(2025, 9, 10), judging_start=datetime(2025, 9, 11), judging_end=datetime(2025, 9, 18), is_closed=False, following=False),
-                    models.Bounty(description="Edit a video showing a creative use of slow motion in sports.", creator_handle="FrameFrenzy", prize_pool=60.0, cutoff_date=datetime(2025, 9, 15), judging_start=datetime(2025, 9, 16), judging_end=datetime(2025, 9, 22), is_closed=False, following=False),
-                    models.Bounty(description="Produce a tutorial for beginners on setting up a home video studio.", creator_handle="ClipCrafter", prize_pool=80.0, cutoff_date=datetime(2025, 9, 20), judging_start=datetime(2025, 9, 21), judging_end=datetime(2025, 9, 28), is_closed=False, following=False),
-                    models.Bounty(description="Make a travel vlog covering at least 5 countries in under 5 minutes.", creator_handle="MontageMaven", prize_pool=120.0, cutoff_date=datetime(2025, 9, 25), judging_start=datetime(2025, 9, 26), judging_end=datetime(2025, 10, 2), is_closed=False, following=False),
-                    models.Bounty(description="Show off your best VFX lightning effect in a short clip.", creator_handle="VFXValkyrie", prize_pool=90.0, cutoff_date=datetime(2025, 9, 30), judging_start=datetime(2025, 10, 1), judging_end=datetime(2025, 10, 7), is_closed=False, following=False),
-                    models.Bounty(description="Create a compilation of funny pet fails with creative editing.", creator_handle="ViralVisionary", prize_pool=55.0, cutoff_date=datetime(2025, 9, 12), judging_start=datetime(2025, 9, 13), judging_end=datetime(2025, 9, 19), is_closed=False, following=False),
-                    models.Bounty(description="Explain a technical concept visually using animation or graphics.", creator_handle="RenderRogue", prize_pool=70.0, cutoff_date=datetime(2025, 9, 18), judging_start=datetime(2025, 9, 19), judging_end=datetime(2025, 9, 25), is_closed=False, following=False),
-                ]
-                db.add_all(bounties)
-                db.commit()
-
-                # Re-query committed objects for correct IDs
-                users = db.query(models.User).all()
-                videos = db.query(models.Video).all()
-                bounties = db.query(models.Bounty).all()
-                video_map = {v.title: v for v in videos}
-                bounty_map = {b.description: b for b in bounties}
-                user_map = {u.handle: u for u in users}
-                submissions = [
-                    # Drone montage bounty (using existing videos)
-                    models.BountySubmission(bounty_id=bounty_map["Create a montage of drone footage with at least 3 different locations."].id, creator_handle=user_map["EditEagle"].handle, video_id=video_map["Speedrun Editing: 60s Transformation"].id),
-                    models.BountySubmission(bounty_id=bounty_map["Create a montage of drone footage with at least 3 different locations."].id, creator_handle=user_map["MontageMaster"].handle, video_id=video_map["Travel Vlog: 10 Countries in 5 Minutes"].id),
-                    # Slow motion sports bounty
-                    models.BountySubmission(bounty_id=bounty_map["Edit a video showing a creative use of slow motion in sports."].id, creator_handle=user_map["JumpCutJedi"].handle, video_id=video_map["Jump Cut Masterclass"].id),
-                    models.BountySubmission(bounty_id=bounty_map["Edit a video showing a creative use of slow motion in sports."].id, creator_handle=user_map["TransitionTiger"].handle, video_id=video_map["Whip Pan Transition Demo"].id),
-                    # Home studio bounty
-                    models.BountySubmission(bounty_id=bounty_map["Produce a tutorial for beginners on setting up a home video studio."].id, creator_handle=user_map["CodeCrusader"].handle, video_id=video_map["Python Animation Challenge"].id),
-                    models.BountySubmission(bounty_id=bounty_map["Produce a tutorial for beginners on setting up a home video studio."].id, creator_handle=user_map["SoundSensei"].handle, video_id=video_map["Sound Design Basics in 50s"].id),
-                    # Travel vlog bounty
-                    models.BountySubmission(bounty_id=bounty_map["Make a travel vlog covering at least 5 countries in under 5 minutes."].id, creator_handle=user_map["MontageMaster"].handle, video_id=video_map["Mountain Hike Timelapse"].id),
-                    # VFX lightning bounty
-                    models.BountySubmission(bounty_id=bounty_map["Show off your best VFX lightning effect in a short clip."].id, creator_handle=user_map["VFXVirtuoso"].handle, video_id=video_map["VFX Lightning Tutorial"].id),
-                    models.BountySubmission(bounty_id=bounty_map["Show off your best VFX lightning effect in a short clip."].id, creator_handle=user_map["VFXVirtuoso"].handle, video_id=video_map["Particle Explosion Demo"].id),
-                    # Pet fails bounty
-                    models.BountySubmission(bounty_id=bounty_map["Create a compilation of funny pet fails with creative editing."].id, creator_handle=user_map["PetPrankster"].handle, video_id=video_map["Best Cat Fails 2025"].id),
-                    models.BountySubmission(bounty_id=bounty_map["Create a compilation of funny pet fails with creative editing."].id, creator_handle=user_map["PetPrankster"].handle, video_id=video_map["Snappy Pet Intro Sequence"].id),
-                    # Technical animation bounty
-                    models.BountySubmission(bounty_id=bounty_map["Explain a technical concept visually using animation or graphics."].id, creator_handle=user_map["CodeCrusader"].handle, video_id=video_map["Keyboard Macro Setup Fast"].id),
-                    models.BountySubmission(bounty_id=bounty_map["Explain a technical concept visually using animation or graphics."].id, creator_handle=user_map["MaskMagician"].handle, video_id=video_map["Quick Masking Trick"].id),
-                ]
-                db.add_all(submissions)
-                db.commit()
-        except SQLAlchemyError as e:
-            print(f"Error during startup data initialization: {e}")
-
-    yield
-
-    # Cleanup logic
-    with Session(engine) as db:
-        try:
-            # Example cleanup: Remove test data (if needed)
-            db.query(models.Bounty).delete()
-            db.query(models.Video).delete()
-            db.query(models.User).delete()
-            db.commit()
-        except SQLAlchemyError as e:
-            print(f"Error during cleanup: {e}")
+    fraud_models.start()
+    await asyncio.to_thread(init_data)
+    event_writer.start()
+    video_counters.start()
+    event_rollup.start()
+    notifications.start()
+    bounty_scheduler.start()
+
+    try:
+        yield
+    finally:
+        # Cleanup logic
+        event_writer.close()
+        video_counters.close()
+        event_rollup.close()
+        bounty_scheduler.close()
+        notifications.close()
+        fraud_scorer.close()
+        fraud_models.close()
+        if contribution_batcher is not None:
+            contribution_batcher.close()
+        viewer_features.clear()
+        velocity_tracker.clear()
+        await moderation.aclose()
+        await async_engine.dispose()
+        similarity_index.clear()
+        leaderboard.clear()
+        voting_feed.clear()
+        phash_index.clear()
+        bounty_scheduler.clear()
+        if DB_EPHEMERAL:
+            with Session(engine) as db:
+                try:
+                    # Example cleanup: Remove test data (if needed)
+                    db.query(models.Bounty).delete()
+                    db.query(models.Video).delete()
+                    db.query(models.User).delete()
+                    db.commit()
+                except SQLAlchemyError as e:
+                    print(f"Error during cleanup: {e}")
 
 app = FastAPI(title="Duuck API", lifespan=lifespan)
 
+metrics.instrument_app(app)
+metrics.instrument_engine(engine)
+metrics.instrument_engine(async_engine.sync_engine)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000/main.lynx.bundle"],  # Frontend origin
@@ -150,6 +185,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def _json_response(request: Request, payload, headers: dict | None = None) -> Response:
+    """Serialize a (possibly cached) payload with an ETag, answering 304 when If-None-Match matches."""
+    body = json.dumps(payload).encode()
+    headers = {**(headers or {}), "ETag": etag_for(body)}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
 @app.post("/user/create")
 def create_user(user_handle: str, db: Session = Depends(get_db)):
     new_user = User(
@@ -174,11 +217,54 @@ def get_default_user(db: Session = Depends(get_db)):
         "total_interactions": user.total_interactions
     }
 
+@app.get("/user/{user_handle}/notifications")
+def get_user_notifications(
+    user_handle: str,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str = Query(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Endpoint to page through a user's notifications, newest first.
+    Pass `next_cursor` back as `cursor` for the next page.
+    """
+    try:
+        rows, next_cursor = get_inbox(db, user_handle, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "notifications": [
+            {"id": n.id, "bounty_id": n.bounty_id, "phase": n.phase, "created_at": n.created_at.isoformat()}
+            for n in rows
+        ],
+        "next_cursor": next_cursor
+    }
+
+@app.get("/user/{user_handle}/stats")
+def get_user_stats(user_handle: str, db: Session = Depends(get_db)):
+    """
+    Endpoint to fetch a user's rolled-up app time, interactions and donations, plus recent rates.
+    """
+    user = db.get(User, user_handle)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    seconds, interactions, donations = event_rollup.pending("user", user_handle)
+    return {
+        "handle": user.handle,
+        "time_spent_on_app": user.time_spent_on_app + seconds // SECONDS_PER_APP_MINUTE,
+        "total_interactions": user.total_interactions + interactions,
+        "total_donations": user.total_donations + donations,
+        "rates": event_rollup.rates("user", user_handle)
+    }
+
 @app.post("/video/create")
 def create_video(v: schemas.VideoCreate, db: Session = Depends(get_db)):
-    vid = models.Video(creator_handle=v.creator_handle, title=v.title, phash=v.phash, length=v.length)
+    vid = models.Video(creator_handle=v.creator_handle, title=v.title, phash=v.phash, length=v.duration)
     db.add(vid); db.commit(); db.refresh(vid)
-    return {"id": vid.id}
+    phash_index.add(vid.id, vid.phash, vid.creator_handle)
+    # Uploads are accepted but flagged when they look like another creator's video
+    duplicates = [video_id for video_id, creator, _ in phash_index.duplicates_of(vid.id) if creator != vid.creator_handle]
+    return {"id": vid.id, "possible_duplicates": duplicates}
 
 @app.put("/video/{video_id}")
 def update_video(
@@ -215,63 +301,150 @@ def update_video(
         updated_fields["likes"] = likes
     db.commit()
     db.refresh(video)
+    response_cache.invalidate_video(video_id)
+    # List pages embed each submission's video
+    response_cache.invalidate_bounty_list()
     return {"id": video.id, **updated_fields}
 
 
 # Get a video by id
 @app.get("/video/{video_id}")
-def get_video(video_id: int, db: Session = Depends(get_db)):
+def get_video(video_id: int, request: Request, db: Session = Depends(get_db)):
+    cached = response_cache.get("video", video_id)
+    if cached is None:
+        video = db.get(models.Video, video_id)
+        if not video:
+            raise HTTPException(status_code=404, detail="Video not found")
+        payload = {
+            "id": video.id,
+            "title": video.title,
+            "creator_handle": video.creator_handle,
+            "views": video.views,
+            "length": video.length,
+            "votes": video.votes,
+            "likes": video.likes
+        }
+        response_cache.set("video", video_id, payload=payload)
+    else:
+        payload, _ = cached
+    # Stored counters are cached; increments still waiting for a flush are merged per request
+    return _json_response(request, {**payload, **video_counters.merge(video_id, payload)})
+
+@app.get("/video/{video_id}/stats")
+def get_video_stats(video_id: int, db: Session = Depends(get_db)):
+    """
+    Endpoint to fetch a video's rolled-up watch time, interactions and donations, plus recent rates.
+    """
     video = db.get(models.Video, video_id)
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
+    seconds, interactions, donations = event_rollup.pending("video", video_id)
     return {
         "id": video.id,
-        "title": video.title,
-        "creator_handle": video.creator_handle,
-        "views": video.views,
-        "length": video.length,
-        "votes": video.votes,
-        "likes": video.likes
+        "total_watch_seconds": (video.total_watch_seconds or 0) + seconds,
+        "total_interactions": (video.total_interactions or 0) + interactions,
+        "total_donations": (video.total_donations or 0.0) + donations,
+        "rates": event_rollup.rates("video", video_id)
     }
 
+@app.post("/video/counters")
+def increment_video_counters_bulk(increments: list[schemas.VideoCountersIn], db: Session = Depends(get_db)):
+    """
+    Endpoint to queue view/like/vote increments for many videos at once.
+    """
+    video_ids = {inc.video_id for inc in increments}
+    known = set(db.scalars(select(models.Video.id).where(models.Video.id.in_(video_ids)))) if video_ids else set()
+    if video_ids - known:
+        raise HTTPException(status_code=404, detail=f"Videos not found: {sorted(video_ids - known)}")
+    for inc in increments:
+        video_counters.add(inc.video_id, inc.views, inc.likes, inc.votes)
+    return {"queued": len(increments)}
+
+@app.post("/video/{video_id}/counters")
+def increment_video_counters(video_id: int, inc: schemas.VideoCounters, db: Session = Depends(get_db)):
+    """
+    Endpoint to queue view/like/vote increments for a video.
+    Increments are applied to the stored totals on the next flush.
+    """
+    if not db.get(models.Video, video_id):
+        raise HTTPException(status_code=404, detail="Video not found")
+    video_counters.add(video_id, inc.views, inc.likes, inc.votes)
+    return {"id": video_id, "queued": True}
+
 @app.post("/session/start")
 def session_start(s: schemas.SessionStart, db: Session = Depends(get_db)):
     ses = models.Session(viewer_handle=s.viewer_handle)
     db.add(ses); db.commit(); db.refresh(ses)
     return {"session_id": ses.id}
 
+def _event_row(ev: schemas.SessionEventIn, viewer, flagged: bool) -> dict:
+    return {
+        "session_id": ev.session_id,
+        "video_id": ev.video_id,
+        "viewer_handle": viewer.viewer_handle,
+        "seconds_watched": ev.seconds_watched,
+        "interactions": ev.interactions,
+        "donation_amount": ev.donation_amount,
+        "status": "under_review" if flagged else "approved",
+        "created_at": datetime.now(),
+    }
+
 @app.post("/session/event")
-def session_event(ev: schemas.SessionEventIn, db: Session = Depends(get_db)):
-    video = db.get(models.Video, ev.video_id)
-    e = models.SessionEvent(
-        session_id=ev.session_id,
-        video_id=ev.video_id,
-        seconds_watched=ev.seconds_watched,
-        interactions=ev.interactions,
-        donation_amount=ev.donation_amount,
-        status="pending"
-    )
+async def session_event(ev: schemas.SessionEventIn, db: AsyncSession = Depends(get_async_db)):
+    viewer = await db.run_sync(viewer_features.get, ev.session_id)
+    if viewer is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    # Use the fraud detection model to check for suspicious donations; scoring runs on the batch worker thread
+    velocity = velocity_tracker.observe(viewer.viewer_handle, ev.video_id, ev.donation_amount)
+    is_suspicious = await asyncio.wrap_future(fraud_scorer.submit(build_features(ev, viewer, velocity)))
+    row = _event_row(ev, viewer, is_suspicious)
+
+    if SESSION_EVENT_WRITE_BEHIND:
+        if event_writer.enqueue([row]):
+            # Backpressure: write the backlog out on a worker thread, not the event loop
+            await run_in_threadpool(event_writer.flush)
+        event_rollup.add([row])
+        return {"event_id": None, "status": row["status"], "queued": True}
+
+    e = models.SessionEvent(**row)
     db.add(e)
-    db.commit()
-
-    # Use the fraud detection model to check for suspicious donations
-    features = [
-        ev.seconds_watched,
-        ev.interactions,
-        db.get(models.User, db.get(models.Session, ev.session_id).viewer_handle).total_interactions,
-        ev.donation_amount,
-        db.get(models.User, db.get(models.Session, ev.session_id).viewer_handle).total_donations,
-        db.get(models.User, db.get(models.Session, ev.session_id).viewer_handle).time_spent_on_app,
-        db.get(models.User, db.get(models.Session, ev.session_id).viewer_handle).account_age_days
-    ]
-    is_suspicious = fraud_model.predict([features])[0] 
-
-    if is_suspicious:
-        e.status = "under_review"
-        db.commit()
-        return {"event_id": e.id, "status": "under_review"}
+    await db.commit()
+    event_rollup.add([row])
+    return {"event_id": e.id, "status": e.status}
 
-    return {"event_id": e.id, "status": "approved"}
+@app.post("/session/events")
+async def session_events(evs: list[schemas.SessionEventIn], db: AsyncSession = Depends(get_async_db)):
+    """
+    Bulk variant of /session/event: scores every event with a single model call and inserts them together.
+    """
+    viewers = {}
+    for session_id in {ev.session_id for ev in evs}:
+        viewer = await db.run_sync(viewer_features.get, session_id)
+        if viewer is None:
+            raise HTTPException(status_code=404, detail=f"Session not found: {session_id}")
+        viewers[session_id] = viewer
+
+    rows = []
+    for ev in evs:
+        viewer = viewers[ev.session_id]
+        velocity = velocity_tracker.observe(viewer.viewer_handle, ev.video_id, ev.donation_amount)
+        rows.append(build_features(ev, viewer, velocity))
+    flags = await run_in_threadpool(fraud_scorer.score_many, rows)
+    rows = [_event_row(ev, viewers[ev.session_id], flagged) for ev, flagged in zip(evs, flags)]
+
+    if SESSION_EVENT_WRITE_BEHIND:
+        if event_writer.enqueue(rows):
+            # Backpressure: write the backlog out on a worker thread, not the event loop
+            await run_in_threadpool(event_writer.flush)
+        event_rollup.add(rows)
+        return [{"event_id": None, "status": row["status"], "queued": True} for row in rows]
+
+    events = [models.SessionEvent(**row) for row in rows]
+    db.add_all(events)
+    await db.commit()
+    event_rollup.add(rows)
+    return [{"event_id": e.id, "status": e.status} for e in events]
 
 @app.post("/session/close")
 def session_close(session_id: int, platform_match_pool: float = 0.5, db: Session = Depends(get_db)):
@@ -279,57 +452,62 @@ def session_close(session_id: int, platform_match_pool: float = 0.5, db: Session
     ses.ended_at = datetime.now(); db.commit()
     return {"session_id": session_id}
 
-@app.get("/bounty")
-def get_top_bounties(db: Session = Depends(get_db)):
+@app.get("/bounty", response_model=list[BountyOut])
+async def get_top_bounties(
+    request: Request,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    cursor: str = Query(None),
+    db: AsyncSession = Depends(get_async_db)
+):
     """
-    Endpoint to fetch top bounty ideas.
+    Endpoint to fetch top bounty ideas, ranked by prize pool.
+    Pass the X-Next-Cursor response header back as `cursor` for the next page.
     """
-    bounties = db.query(models.Bounty).all()  # Default sorting by donations assumed
-    result = []
-    for bounty in bounties:
-        # Use relationship to get all submissions and their videos
-        seen_creator_handles = set()
-        current_videos = []
-        for submission in bounty.submissions:
-            v = submission.video
-            if v and v.creator_handle not in seen_creator_handles:
-                video_data = {
-                    "id": v.id,
-                    "title": v.title,
-                    "creator_handle": v.creator_handle,
-                    "views": v.views,
-                    "duration": v.length,
-                    "votes": v.votes,
-                    "likes": v.likes
-                }
-                current_videos.append(video_data)
-                seen_creator_handles.add(v.creator_handle)
-        bounty_dict = {
-            "id": bounty.id,
-            "description": bounty.description,
-            "prize_pool": bounty.prize_pool,
-            "cutoff_date": bounty.cutoff_date.isoformat(),
-            "judging_start": bounty.judging_start.isoformat(),
-            "judging_end": bounty.judging_end.isoformat(),
-            "is_closed": bounty.is_closed,
-            "current_videos": current_videos,
-            "following": bounty.following
-        }
-        result.append(bounty_dict)
-    return result
+    if leaderboard.refresh_due():
+        rows = (await db.execute(select(Bounty.id, Bounty.prize_pool))).all()
+        if leaderboard.refresh(rows):
+            response_cache.invalidate_bounty_list()
+    cached = response_cache.get("bounties", limit, offset, cursor)
+    if cached is None:
+        try:
+            ids, next_cursor = leaderboard.page(limit, offset, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        headers = {"X-Total-Count": str(len(leaderboard))}
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        payload = jsonable_encoder(await db.run_sync(load_bounty_feed, ids))
+        response_cache.set("bounties", limit, offset, cursor, payload=payload, headers=headers)
+    else:
+        payload, headers = cached
+    return _json_response(request, payload, headers)
 
 @app.post("/bounty/create", response_model=BountyOut)
-def create_bounty(bounty: BountyCreate, db: Session = Depends(get_db)):
+async def create_bounty(bounty: BountyCreate, db: AsyncSession = Depends(get_async_db)):
     # User needs at least a minimum amount to create a bounty
     if bounty.prize_pool < 10.0:
         raise HTTPException(status_code=400, detail="Invalid prize pool. Prize pool must be at least 10.0")
-    response = moderate_idea(bounty.description)
-    if not response.get("is_safe"):
-        raise HTTPException(status_code=400, detail="Inappropriate content detected")
-    bounty.description = response.get("summary")
-    response = find_similar_idea(bounty.description, [b.description for b in db.query(Bounty).all()])
-    if len(response.get("similar")) != 0:
-        raise HTTPException(status_code=400, detail="Similar bounty already exists: " + "; ".join(response.get("similar")))
+    try:
+        response = await moderation.moderate_idea(bounty.description)
+        if not response.get("is_safe"):
+            raise HTTPException(status_code=400, detail="Inappropriate content detected")
+        bounty.description = response.get("summary")
+        # Pick up bounties created by other workers or bulk imports since this index was last synced
+        created_elsewhere = (await db.execute(
+            select(Bounty.id, Bounty.description).where(Bounty.id > similarity_index.last_id, Bounty.is_closed == False)
+        )).all()
+        if created_elsewhere:
+            await run_in_threadpool(similarity_index.add_many, created_elsewhere)
+        candidates = await run_in_threadpool(similarity_index.top_k, bounty.description, k=SIMILARITY_TOP_K, min_score=SIMILARITY_THRESHOLD)
+        similar = []
+        if candidates:
+            response = await moderation.find_similar_idea(bounty.description, [description for _, description, _ in candidates])
+            similar = response.get("similar")
+    except httpx.HTTPError:
+        raise HTTPException(status_code=503, detail="Idea moderation service unavailable")
+    if len(similar) != 0:
+        raise HTTPException(status_code=400, detail="Similar bounty already exists: " + "; ".join(similar))
     new_bounty = Bounty(
         creator_handle=bounty.creator_handle,
         description=bounty.description,
@@ -340,8 +518,11 @@ def create_bounty(bounty: BountyCreate, db: Session = Depends(get_db)):
         is_closed=False
     )
     db.add(new_bounty)
-    db.commit()
-    db.refresh(new_bounty)
+    await db.commit()
+    similarity_index.add(new_bounty.id, new_bounty.description)
+    leaderboard.update(new_bounty.id, new_bounty.prize_pool)
+    bounty_scheduler.track(new_bounty)
+    response_cache.invalidate_bounty_list()
     return {
         "id": new_bounty.id,
         "creator_handle": new_bounty.creator_handle,
@@ -354,35 +535,36 @@ def create_bounty(bounty: BountyCreate, db: Session = Depends(get_db)):
     }
 
 @app.post("/bounty/{bounty_id}/contribute")
-def contribute_bounty(bounty_id: int, viewer_handle: str, amount: float, db: Session = Depends(get_db)):
+async def contribute_bounty(bounty_id: int, viewer_handle: str, amount: float, db: AsyncSession = Depends(get_async_db)):
     # Check if viewer has submitted to this bounty
-    user_submission = db.query(BountySubmission).filter_by(bounty_id=bounty_id, creator_handle=viewer_handle).first()
+    user_submission = await db.scalar(select(BountySubmission.id).filter_by(bounty_id=bounty_id, creator_handle=viewer_handle).limit(1))
     if user_submission:
         raise HTTPException(status_code=403, detail="Submitters cannot donate to this bounty.")
-    bounty = db.get(Bounty, bounty_id)
-    if not bounty or bounty.is_closed:
-        raise HTTPException(status_code=404, detail="Bounty not found or closed")
-    contribution = BountyContribution(bounty_id=bounty_id, viewer_handle=viewer_handle, amount=amount)
-    bounty.prize_pool += amount
-    db.add(contribution)
-
-    # Update viewer's wallet and total_donations
-    viewer = db.query(User).filter_by(handle=viewer_handle).first()
-    if viewer:
-        viewer.wallet -= amount
-        viewer.total_donations += amount
-
-    db.commit()
-    return {"success": True, "new_prize_pool": bounty.prize_pool}
+    if amount <= 0:
+        raise HTTPException(status_code=400, detail="Contribution amount must be positive")
+    try:
+        if contribution_batcher is not None:
+            # Hand the pooled connection back while waiting on the batch
+            await db.close()
+            new_prize_pool = await asyncio.wrap_future(contribution_batcher.submit(bounty_id, viewer_handle, amount))
+        else:
+            new_prize_pool = await db.run_sync(contribute, bounty_id, viewer_handle, amount)
+    except ContributionError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    viewer_features.invalidate(viewer_handle)
+    # Concurrent contributions can finish out of order; keep the larger pool
+    leaderboard.update(bounty_id, new_prize_pool, only_increase=True)
+    response_cache.invalidate_bounty(bounty_id)
+    return {"success": True, "new_prize_pool": new_prize_pool}
 
 @app.post("/bounty/{bounty_id}/submit")
 def submit_bounty(bounty_id: int, creator_handle: str, video_id: int, db: Session = Depends(get_db)):
-    bounty = db.get(Bounty, bounty_id)
-    if not bounty or bounty.is_closed or datetime.now() > bounty.cutoff_date:
+    schedule = _bounty_schedule(db, bounty_id)
+    if not schedule or schedule.phase() != OPEN:
         raise HTTPException(status_code=400, detail="Bounty closed or cutoff passed")
     
     # Condition 1: User who created the bounty cannot submit
-    if bounty.creator_handle == creator_handle:
+    if schedule.creator_handle == creator_handle:
         raise HTTPException(status_code=403, detail="Bounty creator cannot submit a video to their own bounty.")
     
     # Condition 2: User who contributed to the bounty cannot submit
@@ -390,107 +572,157 @@ def submit_bounty(bounty_id: int, creator_handle: str, video_id: int, db: Sessio
     if contribution:
         raise HTTPException(status_code=403, detail="Contributors cannot submit a video to this bounty.")
 
+    # Condition 3: The video, or a near duplicate of it, cannot already be submitted
+    video = db.get(models.Video, video_id)
+    duplicates = []
+    if video:
+        phash_index.add(video.id, video.phash, video.creator_handle)
+        duplicates = phash_index.duplicates_of(video.id)
+    candidate_ids = [video_id] + [dup_id for dup_id, _, _ in duplicates]
+    submitted = db.query(BountySubmission.video_id).filter(
+        BountySubmission.bounty_id == bounty_id, BountySubmission.video_id.in_(candidate_ids)
+    ).first()
+    if submitted and submitted.video_id == video_id:
+        raise HTTPException(status_code=400, detail=f"Video {video_id} already submitted to this bounty")
+    if submitted:
+        raise HTTPException(status_code=400, detail=f"Duplicate of video {submitted.video_id} already submitted to this bounty")
+
     submission = BountySubmission(bounty_id=bounty_id, creator_handle=creator_handle, video_id=video_id)
     db.add(submission)
     db.commit()
-    return {"success": True}
+    voting_feed.invalidate(bounty_id)
+    response_cache.invalidate_bounty(bounty_id)
+    return {
+        "success": True,
+        "possible_duplicates": [dup_id for dup_id, creator, _ in duplicates if creator != creator_handle]
+    }
+
+@app.get("/bounty/{bounty_id}/feed")
+def bounty_voting_feed(
+    bounty_id: int,
+    session_id: int,
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db)
+):
+    """
+    Endpoint to page through a bounty's submissions in the session's shuffled order.
+    Vote counts are left out so the feed does not bias judging.
+    """
+    if not db.get(Bounty, bounty_id):
+        raise HTTPException(status_code=404, detail="Bounty not found")
+    if not db.get(models.Session, session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+    ids, total = voting_feed.page(db, bounty_id, session_id, offset, limit)
+    rows = (
+        db.query(BountySubmission.id, BountySubmission.creator_handle, BountySubmission.video_id, models.Video.title)
+        .outerjoin(models.Video, models.Video.id == BountySubmission.video_id)
+        .filter(BountySubmission.id.in_(ids))
+        .all()
+    ) if ids else []
+    by_id = {row.id: row for row in rows}
+    return {
+        "bounty_id": bounty_id,
+        "session_id": session_id,
+        "total": total,
+        "next_offset": offset + len(ids) if offset + len(ids) < total else None,
+        "submissions": [
+            {
+                "submission_id": sid,
+                "creator_handle": by_id[sid].creator_handle,
+                "video_id": by_id[sid].video_id,
+                "title": by_id[sid].title,
+            }
+            for sid in ids if sid in by_id
+        ]
+    }
 
 @app.post("/bounty/{bounty_id}/vote")
-def vote_bounty(bounty_id: int, submission_id: int, viewer_handle: str, db: Session = Depends(get_db)):
-    bounty = db.get(Bounty, bounty_id)
-    if not bounty or not (bounty.judging_start <= datetime.now() <= bounty.judging_end):
+async def vote_bounty(bounty_id: int, submission_id: int, viewer_handle: str, db: AsyncSession = Depends(get_async_db)):
+    schedule = bounty_scheduler.get(bounty_id) or await db.run_sync(_bounty_schedule, bounty_id)
+    if not schedule or schedule.phase() != JUDGING:
         raise HTTPException(status_code=400, detail="Not in judging period")
    
     # Check if viewer has submitted to this bounty
-    user_submission = db.query(BountySubmission).filter_by(bounty_id=bounty_id, creator_handle=viewer_handle).first()
+    user_submission = await db.scalar(select(BountySubmission.id).filter_by(bounty_id=bounty_id, creator_handle=viewer_handle).limit(1))
     if user_submission:
         raise HTTPException(status_code=403, detail="Submitters cannot vote on this bounty.")
 
-    # Check if viewer has already voted for this submission
-    existing_vote = db.query(BountyVote).filter_by(bounty_id=bounty_id, submission_id=submission_id, viewer_handle=viewer_handle).first()
-    if existing_vote:
-        raise HTTPException(status_code=400, detail="User has already voted for this submission.")
-
+    if not await db.run_sync(record_vote, bounty_id, submission_id):
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="Submission not found for this bounty.")
+    # The unique constraint rejects a second vote for the same submission
     vote = BountyVote(bounty_id=bounty_id, submission_id=submission_id, viewer_handle=viewer_handle)
     db.add(vote)
-    db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="User has already voted for this submission.")
     return {"success": True}
 
 @app.post("/bounty/{bounty_id}/distribute")
 def distribute_bounty(bounty_id: int, db: Session = Depends(get_db)):
-    bounty = db.get(Bounty, bounty_id)
-    if not bounty or datetime.now() < bounty.judging_end or bounty.is_closed:
+    schedule = _bounty_schedule(db, bounty_id)
+    if not schedule or schedule.phase() != AWAITING_PAYOUT:
+        raise HTTPException(status_code=400, detail="Judging not finished or bounty already closed")
+    # The scheduler may have paid it out in the meantime; close_bounty only closes once
+    winners = close_bounty(db, db.get(Bounty, bounty_id))
+    if winners is None:
+        db.rollback()
+        bounty_scheduler.mark_closed(bounty_id)
         raise HTTPException(status_code=400, detail="Judging not finished or bounty already closed")
-    # Count votes per submission
-    votes = db.query(BountyVote.submission_id).filter(BountyVote.bounty_id == bounty_id).all()
-    vote_counts = Counter([v[0] for v in votes])
-    top_submissions = [sid for sid, _ in vote_counts.most_common(3)]
-    splits = [0.5, 0.3, 0.2]
-    winners = []
-    for i, sid in enumerate(top_submissions):
-        submission = db.get(BountySubmission, sid)
-        if submission:
-            prize = round(bounty.prize_pool * splits[i], 2) if i < len(splits) else 0.0
-            # Add prize to winner's weekly_budget
-            winner = db.get(User, submission.creator_id)
-            if winner:
-                winner.wallet += prize
-            winners.append({
-                "submission_id": sid,
-                "creator_handle": submission.creator_handle,
-                "video_id": submission.video_id,
-                "prize": prize
-            })
-    bounty.is_closed = True
     db.commit()
+    bounty_scheduler.mark_closed(bounty_id)
+    similarity_index.remove(bounty_id)
+    response_cache.invalidate_bounty(bounty_id)
+    notifications.publish(bounty_id, CLOSED)
     return {
         "success": True,
-        "winners": winners
+        "winners": [winner_dict(w) for w in winners]
     }
 
 @app.get("/bounty/{bounty_id}", response_model=BountyOut)
-def view_bounty(bounty_id: int, db: Session = Depends(get_db)):
-    bounty = db.get(Bounty, bounty_id)
-    if not bounty:
-        raise HTTPException(status_code=404, detail="Bounty not found")
-    return {
-        "id": bounty.id,
-        "description": bounty.description,
-        "prize_pool": bounty.prize_pool,
-        "cutoff_date": bounty.cutoff_date.isoformat(),
-        "judging_start": bounty.judging_start.isoformat(),
-        "judging_end": bounty.judging_end.isoformat(),
-        "is_closed": bounty.is_closed
-    }
+def view_bounty(bounty_id: int, request: Request, db: Session = Depends(get_db)):
+    cached = response_cache.get("bounty", bounty_id)
+    if cached is None:
+        bounty = db.get(Bounty, bounty_id)
+        if not bounty:
+            raise HTTPException(status_code=404, detail="Bounty not found")
+        payload = {
+            "id": bounty.id,
+            "creator_handle": bounty.creator_handle,
+            "description": bounty.description,
+            "prize_pool": bounty.prize_pool,
+            "cutoff_date": bounty.cutoff_date.isoformat(),
+            "judging_start": bounty.judging_start.isoformat(),
+            "judging_end": bounty.judging_end.isoformat(),
+            "is_closed": bounty.is_closed
+        }
+        response_cache.set("bounty", bounty_id, payload=payload)
+    else:
+        payload, _ = cached
+    return _json_response(request, payload)
 
 @app.get("/bounty/{bounty_id}/winners")
-def view_bounty_winners(bounty_id: int, db: Session = Depends(get_db)):
-    bounty = db.get(Bounty, bounty_id)
-    if not bounty or not bounty.is_closed:
-        raise HTTPException(status_code=400, detail="Bounty not finished or winners not decided yet")
-    # Count votes per submission
-    votes = db.query(BountyVote.submission_id).filter(BountyVote.bounty_id == bounty_id).all()
-    vote_counts = Counter([v[0] for v in votes])
-    top_submissions = [sid for sid, _ in vote_counts.most_common(3)]
-    splits = [0.5, 0.3, 0.2]
-    winners = []
-    for i, sid in enumerate(top_submissions):
-        submission = db.get(BountySubmission, sid)
-        if submission:
-            prize = round(bounty.prize_pool * splits[i], 2) if i < len(splits) else 0.0
-            winners.append({
-                "submission_id": sid,
-                "creator_handle": submission.creator_handle,
-                "video_id": submission.video_id,
-                "prize": prize
-            })
-    return {
-        "bounty_id": bounty_id,
-        "winners": winners
-    }
+def view_bounty_winners(bounty_id: int, request: Request, db: Session = Depends(get_db)):
+    cached = response_cache.get("winners", bounty_id)
+    if cached is None:
+        bounty = db.get(Bounty, bounty_id)
+        if not bounty or not bounty.is_closed:
+            raise HTTPException(status_code=400, detail="Bounty not finished or winners not decided yet")
+        winners = [winner_dict(w) for w in get_winners(db, bounty_id)]
+        payload = {
+            "bounty_id": bounty_id,
+            "winners": winners
+        }
+        response_cache.set("winners", bounty_id, payload=payload)
+    else:
+        payload, _ = cached
+    return _json_response(request, payload)
 
 @app.post("/bounty/{bounty_id}/follow")
-def follow_bounty(bounty_id: int, user_id: int, db: Session = Depends(get_db)):
+def follow_bounty(bounty_id: int, user_handle: str, db: Session = Depends(get_db)):
     """
     Endpoint to allow a user to follow a bounty.
     """
@@ -498,12 +730,93 @@ def follow_bounty(bounty_id: int, user_id: int, db: Session = Depends(get_db)):
     if not bounty:
         raise HTTPException(status_code=404, detail="Bounty not found")
 
-    # Check if the user is already following the bounty
-    existing_follow = db.query(models.BountyFollow).filter_by(bounty_id=bounty_id, user_id=user_id).first()
-    if existing_follow:
-        raise HTTPException(status_code=400, detail="User already following this bounty")
-
-    follow = models.BountyFollow(bounty_id=bounty_id, user_id=user_id)
+    # The unique constraint rejects a second follow by the same user
+    follow = models.BountyFollow(bounty_id=bounty_id, user_handle=user_handle)
     db.add(follow)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="User already following this bounty")
     return {"message": "Bounty followed successfully"}
+
+@app.get("/model")
+def get_model_info():
+    """
+    Endpoint to view the serving fraud model version and per-version counters.
+    """
+    return fraud_models.stats()
+
+@app.post("/model/reload")
+def reload_model():
+    """
+    Endpoint to swap to the newest model file now instead of waiting for the watcher.
+    """
+    try:
+        swapped = fraud_models.reload(force=True)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Model reload failed: {e}")
+    return {"swapped": swapped, "version": fraud_models.current.version}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """
+    Endpoint to scrape latency, DB, fraud model and moderation metrics in Prometheus text format.
+    """
+    if not metrics.ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+BULK_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+BULK_FORMAT_PATTERN = "^(" + "|".join(FORMATS) + ")$"
+
+@app.get("/bulk/{table}/export")
+def bulk_export(table: str, format: str = Query("ndjson", pattern=BULK_FORMAT_PATTERN)):
+    """
+    Endpoint to stream a whole table as NDJSON or CSV.
+    """
+    try:
+        model = get_model(table)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    columns = [column.name for column in model.__table__.columns]
+    return StreamingResponse(
+        format_rows(export_rows(engine, model), format, columns),
+        media_type=BULK_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{table}.{format}"'},
+    )
+
+@app.post("/bulk/{table}/import")
+async def bulk_import(table: str, request: Request, format: str = Query("ndjson", pattern=BULK_FORMAT_PATTERN)):
+    """
+    Endpoint to insert NDJSON or CSV rows from a streamed request body.
+    Rows are committed in chunks, so a bad row leaves the earlier chunks in place.
+    """
+    try:
+        model = get_model(table)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    stream = request.stream()
+
+    def body_chunks():
+        # Runs on the worker thread; pull the async body one chunk at a time
+        while True:
+            try:
+                yield anyio.from_thread.run(stream.__anext__)
+            except StopAsyncIteration:
+                return
+
+    try:
+        count = await run_in_threadpool(import_rows, engine, model, parse_rows(iter_lines(body_chunks()), format))
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid {format} row: {e}")
+    except IntegrityError as e:
+        raise HTTPException(status_code=400, detail=f"Constraint violation: {e.orig}")
+    except StatementError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid {format} row: {e.orig}")
+    if table in ("bounties", "videos", "submissions"):
+        with Session(engine) as db:
+            await run_in_threadpool(warm_indexes, db)
+    response_cache.clear()
+    return {"table": table, "imported": count}
+
@@ -0,0 +1,177 @@
+"""
+Minimal in-process metrics with Prometheus text exposition.
+
+Set METRICS_ENABLED=false to turn every observation into a no-op.
+"""
+import contextvars
+import os
+import threading
+import time
+from bisect import bisect_left
+
+ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+
+def _format_labels(names, values, extra=None) -> str:
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"') for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1.0):
+        if not ENABLED:
+            return
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def value(self, *label_values) -> float:
+        return self._values.get(label_values, 0.0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        if not ENABLED:
+            return
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * len(self.buckets) + [0.0, 0]
+            if i < len(self.buckets):
+                series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, *label_values) -> int:
+        series = self._series.get(label_values)
+        return series[-1] if series else 0
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for label_values, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, n in zip(self.buckets, series):
+                    cumulative += n
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labels, label_values, ('le', bound))} {cumulative}")
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, label_values, ('le', '+Inf'))} {series[-1]}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labels, label_values)} {series[-2]}")
+                lines.append(f"{self.name}_count{_format_labels(self.labels, label_values)} {series[-1]}")
+        return lines
+
+
+HTTP_REQUEST_SECONDS = Histogram("duuck_http_request_duration_seconds", "Request latency by route.", ("method", "route", "status"))
+DB_QUERY_SECONDS = Histogram("duuck_db_query_duration_seconds", "Duration of individual SQL statements.")
+DB_QUERIES_PER_REQUEST = Histogram("duuck_db_queries_per_request", "SQL statements executed per request.", ("route",), SIZE_BUCKETS)
+DB_TIME_PER_REQUEST = Histogram("duuck_db_time_per_request_seconds", "Time spent in SQL per request.", ("route",))
+FRAUD_PREDICT_SECONDS = Histogram("duuck_fraud_predict_duration_seconds", "Fraud model predict() latency per batch.", ("version",))
+FRAUD_BATCH_SIZE = Histogram("duuck_fraud_batch_size", "Rows scored per fraud model call.", (), SIZE_BUCKETS)
+MODERATION_SECONDS = Histogram("duuck_moderation_request_duration_seconds", "Idea moderation round-trip time.", ("path",))
+MODERATION_CACHE = Counter("duuck_moderation_cache_total", "Idea moderation cache lookups.", ("path", "result"))
+
+ALL_METRICS = [
+    HTTP_REQUEST_SECONDS, DB_QUERY_SECONDS, DB_QUERIES_PER_REQUEST, DB_TIME_PER_REQUEST,
+    FRAUD_PREDICT_SECONDS, FRAUD_BATCH_SIZE, MODERATION_SECONDS, MODERATION_CACHE,
+]
+
+
+def register(metric):
+    """Add a metric defined elsewhere to the /metrics output."""
+    ALL_METRICS.append(metric)
+    return metric
+
+
+def render() -> str:
+    lines = []
+    for metric in ALL_METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+class RequestStats:
+    __slots__ = ("queries", "query_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.query_seconds = 0.0
+
+
+# Set per request by the middleware; the mutable object is shared with threadpool copies of the context
+request_stats = contextvars.ContextVar("request_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    DB_QUERY_SECONDS.observe(elapsed)
+    stats = request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.query_seconds += elapsed
+
+
+def instrument_engine(engine):
+    """Time every statement on a (sync) engine."""
+    from sqlalchemy import event
+    if not ENABLED:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def instrument_app(app):
+    """Record route latency and per-request DB usage."""
+    if not ENABLED:
+        return
+
+    @app.middleware("http")
+    async def metrics_middleware(request, call_next):
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            elapsed = time.perf_counter() - start
+            request_stats.reset(token)
+            route = request.scope.get("route")
+            path = route.path if route is not None else "unmatched"
+            HTTP_REQUEST_SECONDS.observe(elapsed, request.method, path, status)
+            DB_QUERIES_PER_REQUEST.observe(stats.queries, path)
+            DB_TIME_PER_REQUEST.observe(stats.query_seconds, path)
@@ -0,0 +1,116 @@
+"""
+In-place schema upgrades for persistent databases.
+
+`Base.metadata.create_all` only creates missing tables, so a database
+created by an older build keeps its old column set and new queries fail
+on it. `upgrade_schema` compares the live schema with the models and
+adds what is missing: columns (ALTER TABLE ... ADD COLUMN, with the
+model's scalar default for existing rows), indexes and unique
+constraints (as unique indexes). Columns that cannot be added in place
+raise instead of leaving a half-working database.
+"""
+import os
+
+from sqlalchemy import Column, Index, MetaData, Table, UniqueConstraint, inspect, literal
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateIndex
+
+from . import models  # noqa: F401  (registers the tables on Base)
+from .db import Base
+from .voting import recount_votes
+
+# Run after a column is added to fill it from existing data
+BACKFILLS = {
+    ("bounty_submissions", "vote_count"): lambda conn: recount_votes(conn),
+}
+
+
+class SchemaMismatchError(RuntimeError):
+    pass
+
+
+def _column_ddl(column, dialect) -> str:
+    preparer = dialect.identifier_preparer
+    ddl = f"{preparer.format_column(column)} {column.type.compile(dialect=dialect)}"
+    default = column.default.arg if column.default is not None and column.default.is_scalar else None
+    if default is not None:
+        value = literal(default, column.type).compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+        ddl += f" DEFAULT {value}"
+    if not column.nullable:
+        if default is None:
+            raise SchemaMismatchError(
+                f"Cannot add NOT NULL column {column.table.name}.{column.name} without a default; migrate it by hand"
+            )
+        ddl += " NOT NULL"
+    return ddl
+
+
+def pending_changes(engine) -> list[tuple[str, object]]:
+    """("column" | "index", schema item) pairs the live database is missing."""
+    inspector = inspect(engine)
+    missing = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue  # create_all makes it, indexes included
+        columns = {c["name"] for c in inspector.get_columns(table.name)}
+        missing += [("column", column) for column in table.columns if column.name not in columns]
+        indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+        indexes |= {u["name"] for u in inspector.get_unique_constraints(table.name)}
+        missing += [("index", index) for index in table.indexes if index.name not in indexes]
+        missing += [
+            ("index", _detached_unique_index(constraint))
+            for constraint in table.constraints
+            if isinstance(constraint, UniqueConstraint) and constraint.name and constraint.name not in indexes
+        ]
+    return missing
+
+
+def _detached_unique_index(constraint) -> Index:
+    # Index() on the model's columns would attach itself to Base.metadata and
+    # make later create_all calls emit an index named like the constraint
+    columns = [Column(column.name, column.type) for column in constraint.columns]
+    Table(constraint.table.name, MetaData(), *columns)
+    return Index(constraint.name, *columns, unique=True)
+
+
+def upgrade_schema(engine, apply: bool = True) -> list[str]:
+    """
+    Bring an existing database up to the models' schema. With
+    `apply=False` nothing is changed and any difference raises
+    SchemaMismatchError. Returns the statements that were run.
+    """
+    changes = pending_changes(engine)
+    if not changes:
+        return []
+    dialect = engine.dialect
+    statements = []
+    for kind, item in changes:
+        if kind == "column":
+            table = dialect.identifier_preparer.format_table(item.table)
+            statements.append((item, f"ALTER TABLE {table} ADD COLUMN {_column_ddl(item, dialect)}"))
+        else:
+            statements.append((item, str(CreateIndex(item).compile(dialect=dialect))))
+    if not apply:
+        raise SchemaMismatchError(
+            "Database schema is out of date; start with DB_AUTO_MIGRATE=true or run:\n"
+            + ";\n".join(sql for _, sql in statements)
+        )
+    applied = []
+    for item, sql in statements:
+        try:
+            with engine.begin() as conn:
+                conn.exec_driver_sql(sql)
+                backfill = BACKFILLS.get((item.table.name, item.name))
+                if backfill is not None:
+                    backfill(conn)
+        except IntegrityError as e:
+            # Existing duplicates block a unique index; the table still works without it
+            print(f"Error adding {item.name} to {item.table.name}, remove the duplicate rows and restart: {e.orig}")
+            continue
+        print(f"Schema upgrade: {sql}")
+        applied.append(sql)
+    return applied
+
+
+def upgrade_schema_from_env(engine) -> list[str]:
+    return upgrade_schema(engine, apply=os.getenv("DB_AUTO_MIGRATE", "true").lower() == "true")
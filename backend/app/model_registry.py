@@ -0,0 +1,179 @@
+import glob
+import hashlib
+import os
+import threading
+import time
+
+import joblib
+
+from . import metrics
+
+DEFAULT_MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "models")
+
+
+class ModelVersion:
+    """A loaded estimator plus its serving counters."""
+
+    def __init__(self, model, version: str, path: str, fingerprint):
+        self.model = model
+        self.version = version
+        self.path = path
+        self.fingerprint = fingerprint
+        self.loaded_at = time.time()
+        self.predictions = 0
+        self.positives = 0
+        self.batches = 0
+        self.total_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, preds, seconds: float):
+        with self._lock:
+            self.predictions += len(preds)
+            self.positives += int(sum(bool(p) for p in preds))
+            self.batches += 1
+            self.total_seconds += seconds
+
+    def stats(self) -> dict:
+        with self._lock:
+            uptime = max(time.time() - self.loaded_at, 1e-9)
+            return {
+                "version": self.version,
+                "path": self.path,
+                "loaded_at": self.loaded_at,
+                "predictions": self.predictions,
+                "flagged": self.positives,
+                "batches": self.batches,
+                "predictions_per_sec": self.predictions / uptime,
+                "flag_rate": self.positives / self.predictions if self.predictions else 0.0,
+                "avg_batch_latency_ms": self.total_seconds / self.batches * 1000 if self.batches else 0.0,
+            }
+
+
+class ModelRegistry:
+    """
+    Serves the newest `*.pkl` in `model_dir` and hot-swaps to a newer file
+    when one is dropped in.
+
+    Models are loaded with joblib `mmap_mode` so their arrays are read-only
+    memory maps shared across forked workers. A swap replaces a single
+    reference, so batches already holding the previous version finish on it.
+    Rows are `n_features` wide; a model trained on fewer columns is given
+    the leading ones.
+    """
+
+    def __init__(self, model_dir: str, pattern: str = "*.pkl", mmap_mode: str | None = "r",
+                 poll_interval: float = 5.0, n_features: int | None = 7, history: int = 5):
+        self.model_dir = model_dir
+        self.pattern = pattern
+        self.mmap_mode = mmap_mode
+        self.poll_interval = poll_interval
+        self.n_features = n_features
+        self.history = history
+        self._current = None
+        self._retired = []
+        self._rejected = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _newest_file(self):
+        paths = glob.glob(os.path.join(self.model_dir, self.pattern))
+        if not paths:
+            raise FileNotFoundError(f"No model matching {self.pattern!r} in {self.model_dir}")
+        path = max(paths, key=lambda p: (os.stat(p).st_mtime_ns, p))
+        st = os.stat(path)
+        return path, (path, st.st_mtime_ns, st.st_size)
+
+    def _load(self, path: str, fingerprint) -> ModelVersion:
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:12]
+        model = joblib.load(path, mmap_mode=self.mmap_mode)
+        if not hasattr(model, "predict"):
+            raise ValueError(f"{path} does not contain an estimator")
+        if self.n_features is not None and getattr(model, "n_features_in_", self.n_features) > self.n_features:
+            raise ValueError(f"{path} expects {model.n_features_in_} features, more than the {self.n_features} served")
+        return ModelVersion(model, f"{os.path.basename(path)}@{digest}", path, fingerprint)
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Swap to the newest model file if it changed. Returns True on a swap.
+        A file that failed to load is not retried until it changes, unless `force` is set.
+        """
+        with self._lock:
+            path, fingerprint = self._newest_file()
+            if self._current is not None and self._current.fingerprint == fingerprint:
+                return False
+            if fingerprint == self._rejected and not force:
+                return False
+            try:
+                new = self._load(path, fingerprint)
+            except Exception:
+                self._rejected = fingerprint
+                raise
+            if self._current is not None:
+                self._retired = ([self._current] + self._retired)[: self.history]
+            self._current = new
+            return True
+
+    @property
+    def current(self) -> ModelVersion:
+        if self._current is None:
+            self.reload()
+        return self._current
+
+    def predict(self, X):
+        v = self.current
+        width = getattr(v.model, "n_features_in_", None)
+        if width is not None and X.shape[1] > width:
+            X = X[:, :width]
+        start = time.perf_counter()
+        preds = v.model.predict(X)
+        elapsed = time.perf_counter() - start
+        v.record(preds, elapsed)
+        metrics.FRAUD_PREDICT_SECONDS.observe(elapsed, v.version)
+        metrics.FRAUD_BATCH_SIZE.observe(len(X))
+        return preds
+
+    def stats(self) -> dict:
+        current = self._current
+        return {
+            "version": current.version if current else None,
+            "versions": [v.stats() for v in ([current] if current else []) + self._retired],
+        }
+
+    def _watch(self):
+        try:
+            self.reload()
+        except Exception as e:
+            print(f"Error loading fraud model: {e}")
+        while self.poll_interval > 0 and not self._stop.wait(self.poll_interval):
+            try:
+                if self.reload():
+                    print(f"Fraud model hot-swapped to {self._current.version}")
+            except Exception as e:
+                # Keep serving the current version if the new file is bad or half-written
+                print(f"Error reloading fraud model: {e}")
+
+    def start(self):
+        """Load in the background and, if `poll_interval` > 0, keep watching for new files."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watch, name="fraud-model-registry", daemon=True)
+            self._thread.start()
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def create_model_registry() -> ModelRegistry:
+    from .fraud import FEATURE_NAMES
+    return ModelRegistry(
+        os.getenv("FRAUD_MODEL_DIR", DEFAULT_MODEL_DIR),
+        pattern=os.getenv("FRAUD_MODEL_PATTERN", "*.pkl"),
+        mmap_mode=os.getenv("FRAUD_MODEL_MMAP_MODE", "r") or None,
+        poll_interval=float(os.getenv("FRAUD_MODEL_RELOAD_SECONDS", "5")),
+        n_features=len(FEATURE_NAMES),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, DateTime, JSON, Table
+from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, DateTime, JSON, Table, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .db import Base
@@ -19,21 +19,25 @@ class User(Base):
     time_spent_on_app = Column(Integer, default=0)
     account_age_days = Column(Integer, default=0)
     total_interactions = Column(Integer, default=0)  # Total interactions represent the user's interactions with other content
+    # The three totals above before any session event or contribution was rolled in; NULL until recorded (see app.rollups)
+    base_time_spent_on_app = Column(Integer, nullable=True)
+    base_total_interactions = Column(Integer, nullable=True)
+    base_total_donations = Column(Float, nullable=True)
 
 class Video(Base):
     __tablename__ = "videos"
     id = Column(Integer, primary_key=True)
     creator_handle = Column(String, ForeignKey("users.handle"))
     title = Column(String)
-<<<<<<< HEAD
     phash = Column(String, nullable=True)  # mock perceptual hash
-=======
-    phash = Column(String)
     length = Column(Integer)
     views = Column(Integer, default=0)
     votes = Column(Integer, default=0)
     likes = Column(Integer, default=0)
->>>>>>> 9b4395d28ee7a19e1f5eb93fb2d95a578d4d905f
+    # Rolled up from approved session events (see app.rollups)
+    total_watch_seconds = Column(Integer, default=0)
+    total_interactions = Column(Integer, default=0)
+    total_donations = Column(Float, default=0.0)
     creator = relationship("User")
 
 class Session(Base):
@@ -55,6 +59,7 @@ class SessionEvent(Base):
     donation_amount = Column(Float, default=0.0)
     target = Column(Integer, nullable=False, default=0)  # Added default value for target
     status = Column(String, default="pending")  # pending|approved|rejected|under_review
+    created_at = Column(DateTime, default=datetime.now, nullable=True)
 
 class Bounty(Base):
     __tablename__ = "bounties"
@@ -66,11 +71,9 @@ class Bounty(Base):
     judging_start = Column(DateTime)
     judging_end = Column(DateTime)
     is_closed = Column(Boolean, default=False)
-<<<<<<< HEAD
-=======
     following = Column(Boolean, default=False)
+    notified_phase = Column(String, nullable=True)  # last lifecycle phase fanned out to followers (see app.notifications)
     submissions = relationship("BountySubmission", backref="bounty")
->>>>>>> 9b4395d28ee7a19e1f5eb93fb2d95a578d4d905f
 
 class BountyContribution(Base):
     __tablename__ = "bounty_contributions"
@@ -78,6 +81,9 @@ class BountyContribution(Base):
     bounty_id = Column(Integer, ForeignKey("bounties.id"))
     viewer_handle = Column(String, ForeignKey("users.handle"))  # Updated from viewer_id
     amount = Column(Float)
+    __table_args__ = (
+        Index("ix_bounty_contributions_bounty_viewer", "bounty_id", "viewer_handle"),
+    )
 
 class BountySubmission(Base):
     __tablename__ = "bounty_submissions"
@@ -86,10 +92,11 @@ class BountySubmission(Base):
     creator_handle = Column(String, ForeignKey("users.handle"))  # Updated from creator_id
     video_id = Column(Integer, ForeignKey("videos.id"))
     submitted_at = Column(DateTime, default=datetime.utcnow)
-<<<<<<< HEAD
-=======
+    vote_count = Column(Integer, nullable=False, default=0)  # Maintained by vote_bounty
     video = relationship("Video")
->>>>>>> 9b4395d28ee7a19e1f5eb93fb2d95a578d4d905f
+    __table_args__ = (
+        Index("ix_bounty_submissions_bounty_creator", "bounty_id", "creator_handle"),
+    )
 
 class BountyVote(Base):
     __tablename__ = "bounty_votes"
@@ -97,9 +104,41 @@ class BountyVote(Base):
     bounty_id = Column(Integer, ForeignKey("bounties.id"))
     submission_id = Column(Integer, ForeignKey("bounty_submissions.id"))
     viewer_handle = Column(String, ForeignKey("users.handle"))  # Updated from viewer_id
+    __table_args__ = (
+        # One vote per viewer per submission
+        UniqueConstraint("bounty_id", "submission_id", "viewer_handle", name="uq_bounty_votes_bounty_submission_viewer"),
+    )
+
+class BountyWinner(Base):
+    __tablename__ = "bounty_winners"
+    bounty_id = Column(Integer, ForeignKey("bounties.id"), primary_key=True)
+    rank = Column(Integer, primary_key=True)  # 1-based placing
+    submission_id = Column(Integer, ForeignKey("bounty_submissions.id"))
+    creator_handle = Column(String, ForeignKey("users.handle"))
+    video_id = Column(Integer, ForeignKey("videos.id"))
+    votes = Column(Integer)
+    prize = Column(Float)
 
 class BountyFollow(Base):
     __tablename__ = "bounty_follows"
     id = Column(Integer, primary_key=True)
     bounty_id = Column(Integer, ForeignKey("bounties.id"))
-    user_handle = Column(String, ForeignKey("users.handle"))  # Updated from user_id
\ No newline at end of file
+    user_handle = Column(String, ForeignKey("users.handle"))  # Updated from user_id
+    __table_args__ = (
+        # One follow per user per bounty
+        UniqueConstraint("bounty_id", "user_handle", name="uq_bounty_follows_bounty_user"),
+        # Notification fan-out walks a bounty's followers in id order
+        Index("ix_bounty_follows_bounty_id", "bounty_id", "id"),
+    )
+
+class Notification(Base):
+    __tablename__ = "notifications"
+    id = Column(Integer, primary_key=True)
+    user_handle = Column(String, ForeignKey("users.handle"))
+    bounty_id = Column(Integer, ForeignKey("bounties.id"))
+    phase = Column(String)  # see app.lifecycle
+    created_at = Column(DateTime, default=datetime.now)
+    __table_args__ = (
+        # Inbox pages are newest-first per user
+        Index("ix_notifications_user_id", "user_handle", "id"),
+    )
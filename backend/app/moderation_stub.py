@@ -0,0 +1,45 @@
+"""
+Local stand-in for the idea moderation service.
+
+Run with `uvicorn app.moderation_stub:app --port 8001` and point
+IDEA_MODERATION_URL at it, or mount it in-process through
+`httpx.ASGITransport(app=app)`.
+"""
+import json
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+app = FastAPI(title="Duuck moderation stub")
+
+BLOCKED_WORDS = {"violence", "weapon", "hate", "drugs"}
+
+
+class ModerateIn(BaseModel):
+    video_idea: str
+
+
+class SimilarIn(BaseModel):
+    video_idea: str
+    database_ideas: list[str] = []
+
+
+def _tokens(text: str) -> set[str]:
+    return {w.strip(".,!?").lower() for w in text.split() if len(w) > 3}
+
+
+# The real service returns a JSON document encoded as a JSON string, so the stub does too
+@app.post("/duuck/moderate_idea")
+def moderate_idea(body: ModerateIn):
+    is_safe = not (_tokens(body.video_idea) & BLOCKED_WORDS)
+    return json.dumps({"is_safe": is_safe, "summary": body.video_idea.strip()})
+
+
+@app.post("/duuck/similar_idea")
+def similar_idea(body: SimilarIn):
+    tokens = _tokens(body.video_idea)
+    similar = []
+    for idea in body.database_ideas:
+        other = _tokens(idea)
+        if tokens and other and len(tokens & other) / len(tokens | other) >= 0.6:
+            similar.append(idea)
+    return json.dumps({"similar": similar})
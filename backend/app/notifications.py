@@ -0,0 +1,155 @@
+import base64
+import os
+import queue
+import threading
+from datetime import datetime
+
+from sqlalchemy import insert, literal, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from . import models
+from .lifecycle import PHASES
+
+
+class NotificationDispatcher:
+    """
+    Fans bounty phase changes out to follower inboxes.
+
+    Events go through a bounded queue drained by `workers` threads. Each
+    event is written with set-based `INSERT ... SELECT` statements over the
+    bounty's followers, `batch_size` followers per transaction, so a
+    bounty with 100k followers costs a few dozen statements rather than
+    one per follower. Duplicate events queued together are coalesced.
+
+    Every worker process runs its own scheduler and publishes the same
+    phase change, so a phase is first claimed on the bounty row
+    (`notified_phase`); only the process that moves it forward fans out.
+    """
+
+    def __init__(self, engine, batch_size: int = 5000, workers: int = 2, max_pending: int = 10000):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.workers = workers
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._threads = []
+
+    def publish(self, bounty_id: int, phase: str):
+        """Queue a phase change; blocks while the queue is full."""
+        self._queue.put((bounty_id, phase, datetime.now()))
+
+    def claim(self, bounty_id: int, phase: str) -> bool:
+        """Record `phase` as notified unless it, or a later phase, already was."""
+        earlier = PHASES[:PHASES.index(phase)] if phase in PHASES else ()
+        bounty = models.Bounty
+        with self.engine.begin() as conn:
+            result = conn.execute(
+                update(bounty)
+                .where(bounty.id == bounty_id, or_(bounty.notified_phase.is_(None), bounty.notified_phase.in_(earlier)))
+                .values(notified_phase=phase)
+            )
+        return result.rowcount > 0
+
+    def dispatch(self, bounty_id: int, phase: str, created_at: datetime | None = None) -> int:
+        """Claim the phase change and fan it out. Returns 0 if another process already did."""
+        if not self.claim(bounty_id, phase):
+            return 0
+        return self.fan_out(bounty_id, phase, created_at)
+
+    def fan_out(self, bounty_id: int, phase: str, created_at: datetime | None = None) -> int:
+        """Write the event to every follower's inbox. Returns the number of notifications written."""
+        created_at = created_at or datetime.now()
+        follow = models.BountyFollow
+        written = 0
+        after = 0
+        while True:
+            # Bound each chunk by explicit follow ids so follows added mid-way are neither skipped nor repeated
+            upper = select(follow.id).where(follow.bounty_id == bounty_id, follow.id > after).order_by(follow.id)
+            with self.engine.begin() as conn:
+                last = conn.scalar(upper.offset(self.batch_size - 1).limit(1))
+                in_chunk = [follow.bounty_id == bounty_id, follow.id > after]
+                if last is not None:
+                    in_chunk.append(follow.id <= last)
+                result = conn.execute(
+                    insert(models.Notification).from_select(
+                        ["user_handle", "bounty_id", "phase", "created_at"],
+                        select(follow.user_handle, literal(bounty_id), literal(phase), literal(created_at)).where(*in_chunk),
+                    )
+                )
+            written += result.rowcount
+            if last is None:
+                return written
+            after = last
+
+    def _collect(self):
+        item = self._queue.get()
+        if item is None:
+            return None
+        batch = {item[:2]: item[2]}
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Put the sentinel back so the loop exits after this batch
+                self._queue.put(None)
+                break
+            batch.setdefault(item[:2], item[2])
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            for (bounty_id, phase), created_at in batch.items():
+                try:
+                    self.dispatch(bounty_id, phase, created_at)
+                except SQLAlchemyError as e:
+                    print(f"Error notifying followers of bounty {bounty_id} ({phase}): {e}")
+
+    def start(self):
+        self._threads = [t for t in self._threads if t.is_alive()]
+        for i in range(len(self._threads), self.workers):
+            thread = threading.Thread(target=self._run, name=f"notification-fanout-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def close(self):
+        """Stop the workers after draining events that are already queued."""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+
+def encode_cursor(notification_id: int) -> str:
+    return base64.urlsafe_b64encode(str(notification_id).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except ValueError:
+        raise ValueError("Invalid cursor")
+
+
+def get_inbox(db: Session, user_handle: str, limit: int, cursor: str | None = None) -> tuple[list[models.Notification], str | None]:
+    """Newest-first page of the user's notifications and the cursor for the next page."""
+    q = db.query(models.Notification).filter(models.Notification.user_handle == user_handle)
+    if cursor is not None:
+        q = q.filter(models.Notification.id < decode_cursor(cursor))
+    rows = q.order_by(models.Notification.id.desc()).limit(limit + 1).all()
+    next_cursor = encode_cursor(rows[limit - 1].id) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+def create_notification_dispatcher(engine) -> NotificationDispatcher:
+    return NotificationDispatcher(
+        engine,
+        batch_size=int(os.getenv("NOTIFY_BATCH_SIZE", "5000")),
+        workers=int(os.getenv("NOTIFY_WORKERS", "2")),
+        max_pending=int(os.getenv("NOTIFY_MAX_PENDING", "10000")),
+    )
@@ -0,0 +1,100 @@
+import hashlib
+import os
+import threading
+
+
+def parse_phash(phash: str | None) -> int | None:
+    """
+    64-bit integer form of a stored perceptual hash. Hex strings are read
+    as-is; anything else (e.g. the demo "hash15" values) is digested, so
+    only identical strings end up close together.
+    """
+    if not phash:
+        return None
+    try:
+        return int(phash, 16) & 0xFFFFFFFFFFFFFFFF
+    except ValueError:
+        return int.from_bytes(hashlib.blake2b(phash.encode(), digest_size=8).digest(), "big")
+
+
+class PhashIndex:
+    """
+    In-memory BK-tree over video perceptual hashes using Hamming distance.
+
+    The triangle inequality lets a lookup skip every subtree whose edge
+    distance falls outside [d - max_distance, d + max_distance], so
+    near-duplicate queries visit a small fraction of the catalogue.
+    Videos with identical hashes share a node.
+    """
+
+    def __init__(self, max_distance: int = 8):
+        self.max_distance = max_distance
+        self._root = None  # [hash, {video_id: creator_handle}, {distance: child}]
+        self._hashes = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def add(self, video_id: int, phash: str | None, creator_handle: str | None = None):
+        h = parse_phash(phash)
+        if h is None:
+            return
+        with self._lock:
+            self._hashes[video_id] = h
+            if self._root is None:
+                self._root = [h, {video_id: creator_handle}, {}]
+                return
+            node = self._root
+            while True:
+                d = (node[0] ^ h).bit_count()
+                if d == 0:
+                    node[1][video_id] = creator_handle
+                    return
+                child = node[2].get(d)
+                if child is None:
+                    node[2][d] = [h, {video_id: creator_handle}, {}]
+                    return
+                node = child
+
+    def add_many(self, rows):
+        for video_id, phash, creator_handle in rows:
+            self.add(video_id, phash, creator_handle)
+
+    def search(self, phash: str | None, max_distance: int | None = None) -> list[tuple[int, str | None, int]]:
+        """Return (video_id, creator_handle, distance) within `max_distance`, closest first."""
+        h = parse_phash(phash)
+        if h is None:
+            return []
+        if max_distance is None:
+            max_distance = self.max_distance
+        matches = []
+        with self._lock:
+            stack = [self._root] if self._root is not None else []
+            while stack:
+                node = stack.pop()
+                d = (node[0] ^ h).bit_count()
+                if d <= max_distance:
+                    matches.extend((video_id, creator, d) for video_id, creator in node[1].items())
+                for edge, child in node[2].items():
+                    if d - max_distance <= edge <= d + max_distance:
+                        stack.append(child)
+        matches.sort(key=lambda m: (m[2], m[0]))
+        return matches
+
+    def duplicates_of(self, video_id: int, max_distance: int | None = None) -> list[tuple[int, str | None, int]]:
+        """Near duplicates of an indexed video, excluding the video itself."""
+        with self._lock:
+            h = self._hashes.get(video_id)
+        if h is None:
+            return []
+        return [m for m in self.search(format(h, "016x"), max_distance) if m[0] != video_id]
+
+    def clear(self):
+        with self._lock:
+            self._root = None
+            self._hashes.clear()
+
+
+def create_phash_index() -> PhashIndex:
+    return PhashIndex(max_distance=int(os.getenv("PHASH_MAX_DISTANCE", "8")))
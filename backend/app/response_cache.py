@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import threading
+
+from .cache import LRUCache
+
+
+class LocalBackend:
+    """In-process LRU storage for cached responses."""
+
+    def __init__(self, maxsize: int = 4096, ttl: float | None = 30.0):
+        self._entries = LRUCache(maxsize=maxsize, ttl=ttl)
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        return self._entries.get(key)
+
+    def set(self, key: str, value):
+        self._entries.set(key, value)
+
+    def delete(self, *keys: str):
+        for key in keys:
+            self._entries.pop(key)
+
+    def generation(self, name: str) -> int:
+        return self._counters.get(name, 0)
+
+    def bump(self, name: str):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + 1
+
+
+class RedisBackend:
+    """
+    Storage in any Redis-protocol server (Redis, Valkey, KeyDB...), shared
+    by every worker process. Entries are stored as JSON with a TTL.
+    """
+
+    def __init__(self, url: str, ttl: float | None = 30.0, prefix: str = "duuck:rc:"):
+        # redis is an optional dependency; only needed when RESPONSE_CACHE_URL is set
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key: str):
+        raw = self._client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value):
+        ttl_ms = int(self.ttl * 1000) if self.ttl else None
+        self._client.set(self.prefix + key, json.dumps(value), px=ttl_ms)
+
+    def delete(self, *keys: str):
+        if keys:
+            self._client.delete(*(self.prefix + key for key in keys))
+
+    def generation(self, name: str) -> int:
+        return int(self._client.get(self.prefix + "gen:" + name) or 0)
+
+    def bump(self, name: str):
+        self._client.incr(self.prefix + "gen:" + name)
+
+
+class ResponseCache:
+    """
+    Cache of JSON payloads for the read-heavy GET endpoints.
+
+    Single-entity entries (a bounty, a video, a bounty's winners) are
+    deleted by the endpoints that change them. Bounty list pages depend on
+    every bounty's rank, so they are keyed by a generation number that any
+    bounty change bumps; `clear` bumps a global generation instead of
+    scanning keys. Entries also expire after the backend TTL, which bounds
+    how stale the video counters embedded in list pages can get.
+    """
+
+    def __init__(self, backend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+
+    def _key(self, namespace: str, *parts) -> str:
+        key = f"{self.backend.generation('all')}:{namespace}:" + ":".join(str(p) for p in parts)
+        if namespace == "bounties":
+            key += f"@{self.backend.generation('bounties')}"
+        return key
+
+    def get(self, namespace: str, *parts):
+        """Cached (payload, headers) or None."""
+        if not self.enabled:
+            return None
+        try:
+            entry = self.backend.get(self._key(namespace, *parts))
+        except Exception as e:
+            print(f"Error reading response cache: {e}")
+            return None
+        return tuple(entry) if entry is not None else None
+
+    def set(self, namespace: str, *parts, payload, headers: dict | None = None):
+        if not self.enabled:
+            return
+        try:
+            self.backend.set(self._key(namespace, *parts), (payload, headers or {}))
+        except Exception as e:
+            print(f"Error writing response cache: {e}")
+
+    def invalidate_bounty(self, bounty_id: int):
+        """Drop a bounty's detail and winners entries and every list page."""
+        self._safely(self.backend.delete, self._key("bounty", bounty_id), self._key("winners", bounty_id))
+        self.invalidate_bounty_list()
+
+    def invalidate_bounty_list(self):
+        self._safely(self.backend.bump, "bounties")
+
+    def invalidate_video(self, video_id: int):
+        self._safely(self.backend.delete, self._key("video", video_id))
+
+    def clear(self):
+        self._safely(self.backend.bump, "all")
+
+    def _safely(self, fn, *args):
+        if not self.enabled:
+            return
+        try:
+            fn(*args)
+        except Exception as e:
+            print(f"Error invalidating response cache: {e}")
+
+
+def etag_for(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak validators compare equal for GET
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+
+def create_response_cache() -> ResponseCache:
+    ttl = float(os.getenv("RESPONSE_CACHE_TTL", "30")) or None
+    enabled = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    url = os.getenv("RESPONSE_CACHE_URL")
+    backend = None
+    if url and enabled:
+        try:
+            backend = RedisBackend(url, ttl=ttl)
+        except ImportError:
+            print("Error: RESPONSE_CACHE_URL is set but the redis package is not installed; using the in-process cache")
+    if backend is None:
+        backend = LocalBackend(maxsize=int(os.getenv("RESPONSE_CACHE_SIZE", "4096")), ttl=ttl)
+    return ResponseCache(backend, enabled=enabled)
@@ -0,0 +1,390 @@
+"""
+Streaming rollups of session events into per-user and per-video totals.
+
+Approved events are summed in memory as they are accepted and the deltas
+are written back to `users` and `videos` in batches. Sliding-window rates
+are kept in memory only. Run the module to rebuild the totals from the
+raw event table (with the API stopped):
+
+    python -m app.rollups --chunk-size 50000
+"""
+import argparse
+import os
+import threading
+import time
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from . import models
+
+# User.time_spent_on_app is kept in minutes
+SECONDS_PER_APP_MINUTE = 60
+
+
+def _fold(totals: dict, key, seconds, interactions, donations):
+    acc = totals.get(key)
+    if acc is None:
+        totals[key] = [seconds or 0, interactions or 0, donations or 0.0]
+    else:
+        acc[0] += seconds or 0
+        acc[1] += interactions or 0
+        acc[2] += donations or 0.0
+
+
+class SlidingWindow:
+    """
+    Per-key sums over the last `window` seconds, kept in a ring of
+    `buckets` time buckets so an update or read is O(buckets) with no
+    per-event storage.
+    """
+
+    def __init__(self, window: float = 300.0, buckets: int = 30, fields: int = 1):
+        self.window = window
+        self.buckets = buckets
+        self.width = window / buckets
+        self.fields = fields
+        self._keys = {}  # key -> (bucket epochs, per-bucket sums)
+        self._lock = threading.Lock()
+
+    def add(self, key, values, now: float | None = None):
+        epoch = int((now if now is not None else time.time()) // self.width)
+        slot = epoch % self.buckets
+        with self._lock:
+            entry = self._keys.get(key)
+            if entry is None:
+                entry = ([-1] * self.buckets, [[0] * self.fields for _ in range(self.buckets)])
+                self._keys[key] = entry
+            epochs, sums = entry
+            if epochs[slot] != epoch:
+                epochs[slot] = epoch
+                sums[slot] = [0] * self.fields
+            bucket = sums[slot]
+            for i, value in enumerate(values):
+                bucket[i] += value
+
+    def totals(self, key, now: float | None = None) -> list:
+        """Sums of each field over the window."""
+        epoch = int((now if now is not None else time.time()) // self.width)
+        totals = [0] * self.fields
+        with self._lock:
+            entry = self._keys.get(key)
+            if entry is None:
+                return totals
+            epochs, sums = entry
+            for bucket_epoch, bucket in zip(epochs, sums):
+                if epoch - self.buckets < bucket_epoch <= epoch:
+                    for i, value in enumerate(bucket):
+                        totals[i] += value
+        return totals
+
+    def prune(self, now: float | None = None) -> int:
+        """Drop keys with nothing inside the window."""
+        cutoff = int((now if now is not None else time.time()) // self.width) - self.buckets
+        with self._lock:
+            idle = [key for key, (epochs, _) in self._keys.items() if max(epochs) <= cutoff]
+            for key in idle:
+                del self._keys[key]
+        return len(idle)
+
+    def clear(self):
+        with self._lock:
+            self._keys.clear()
+
+    def __len__(self):
+        return len(self._keys)
+
+
+class EventRollup:
+    """
+    Running watch time / interaction / donation totals per viewer and per
+    video, flushed as `col = col + :delta` executemany updates every
+    `flush_interval` seconds. Events flagged for review are left out until
+    they are approved.
+    """
+
+    def __init__(self, engine, flush_interval: float = 5.0, batch_size: int = 1000, window: float = 300.0):
+        self.engine = engine
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.user_windows = SlidingWindow(window, fields=4)
+        self.video_windows = SlidingWindow(window, fields=4)
+        self._users = {}  # handle -> [seconds, interactions, donations]
+        self._videos = {}  # video_id -> [seconds, interactions, donations]
+        self._inflight_users = {}
+        self._inflight_videos = {}
+        self._carry_seconds = {}  # watch seconds below a full app minute
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._user_statement = (
+            update(models.User)
+            .where(models.User.handle == bindparam("key"))
+            .values(
+                time_spent_on_app=models.User.time_spent_on_app + bindparam("d_minutes"),
+                total_interactions=models.User.total_interactions + bindparam("d_interactions"),
+                total_donations=models.User.total_donations + bindparam("d_donations"),
+            )
+        )
+        self._video_statement = (
+            update(models.Video)
+            .where(models.Video.id == bindparam("key"))
+            .values(
+                total_watch_seconds=func.coalesce(models.Video.total_watch_seconds, 0) + bindparam("d_seconds"),
+                total_interactions=func.coalesce(models.Video.total_interactions, 0) + bindparam("d_interactions"),
+                total_donations=func.coalesce(models.Video.total_donations, 0) + bindparam("d_donations"),
+            )
+        )
+
+    def add(self, rows: list[dict], now: float | None = None):
+        """Fold in event rows as built by the session event handlers."""
+        now = now if now is not None else time.time()
+        with self._lock:
+            for row in rows:
+                if row.get("status") != "approved":
+                    continue
+                values = (row.get("seconds_watched"), row.get("interactions"), row.get("donation_amount"))
+                for totals, key in ((self._users, row.get("viewer_handle")), (self._videos, row.get("video_id"))):
+                    if key is not None:
+                        _fold(totals, key, *values)
+        for row in rows:
+            if row.get("status") != "approved":
+                continue
+            values = (1, row.get("seconds_watched") or 0, row.get("interactions") or 0, row.get("donation_amount") or 0.0)
+            if row.get("viewer_handle") is not None:
+                self.user_windows.add(row["viewer_handle"], values, now)
+            if row.get("video_id") is not None:
+                self.video_windows.add(row["video_id"], values, now)
+
+    def pending(self, kind: str, key) -> list:
+        """Unflushed [seconds, interactions, donations] for a user or video."""
+        with self._lock:
+            if kind == "user":
+                sources = (self._users, self._inflight_users)
+            else:
+                sources = (self._videos, self._inflight_videos)
+            totals = [0, 0, 0.0]
+            for source in sources:
+                for i, value in enumerate(source.get(key, ())):
+                    totals[i] += value
+        return totals
+
+    def rates(self, kind: str, key, now: float | None = None) -> dict:
+        """Per-minute event, watch time, interaction and donation rates over the window."""
+        windows = self.user_windows if kind == "user" else self.video_windows
+        minutes = windows.window / 60.0
+        events, seconds, interactions, donations = windows.totals(key, now)
+        return {
+            "window_seconds": windows.window,
+            "events_per_minute": events / minutes,
+            "watch_seconds_per_minute": seconds / minutes,
+            "interactions_per_minute": interactions / minutes,
+            "donations_per_minute": donations / minutes,
+        }
+
+    def flush(self) -> int:
+        """Write pending deltas. Returns the number of users and videos updated."""
+        with self._flush_lock:
+            with self._lock:
+                users, self._users = self._users, {}
+                videos, self._videos = self._videos, {}
+                self._inflight_users, self._inflight_videos = users, videos
+                user_rows = []
+                carried = {}
+                for handle, (seconds, interactions, donations) in users.items():
+                    carried[handle] = self._carry_seconds.pop(handle, 0)
+                    minutes, carry = divmod(carried[handle] + seconds, SECONDS_PER_APP_MINUTE)
+                    if carry:
+                        self._carry_seconds[handle] = carry
+                    user_rows.append({"key": handle, "d_minutes": minutes, "d_interactions": interactions, "d_donations": donations})
+            video_rows = [
+                {"key": video_id, "d_seconds": seconds, "d_interactions": interactions, "d_donations": donations}
+                for video_id, (seconds, interactions, donations) in videos.items()
+            ]
+            if not user_rows and not video_rows:
+                return 0
+            try:
+                with self.engine.begin() as conn:
+                    for statement, rows in ((self._user_statement, user_rows), (self._video_statement, video_rows)):
+                        for i in range(0, len(rows), self.batch_size):
+                            conn.execute(statement, rows[i:i + self.batch_size])
+            except SQLAlchemyError as e:
+                print(f"Error flushing rollups for {len(user_rows)} users and {len(video_rows)} videos, will retry: {e}")
+                with self._lock:
+                    for handle, (seconds, interactions, donations) in users.items():
+                        # This batch's minutes included the old carry; put it back with the seconds
+                        self._carry_seconds.pop(handle, None)
+                        _fold(self._users, handle, carried[handle] + seconds, interactions, donations)
+                    for video_id, values in videos.items():
+                        _fold(self._videos, video_id, *values)
+                return 0
+            finally:
+                with self._lock:
+                    self._inflight_users, self._inflight_videos = {}, {}
+            return len(user_rows) + len(video_rows)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+            self.user_windows.prune()
+            self.video_windows.prune()
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="event-rollup", daemon=True)
+            self._thread.start()
+
+    def close(self):
+        """Stop the flusher and write out anything still buffered."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+
+def create_event_rollup(engine) -> EventRollup:
+    return EventRollup(
+        engine,
+        flush_interval=float(os.getenv("ROLLUP_FLUSH_MS", "5000")) / 1000.0,
+        batch_size=int(os.getenv("ROLLUP_BATCH_SIZE", "1000")),
+        window=float(os.getenv("ROLLUP_WINDOW_SECONDS", "300")),
+    )
+
+
+def _contributed():
+    # Bounty contributions also count towards User.total_donations (see app.contributions)
+    return (
+        select(func.coalesce(func.sum(models.BountyContribution.amount), 0.0))
+        .where(models.BountyContribution.viewer_handle == models.User.handle)
+        .scalar_subquery()
+    )
+
+
+def scan_event_totals(engine, chunk_size: int = 50000) -> tuple[dict, dict, int]:
+    """
+    Sum approved session events per user and per video, scanning the event
+    table in primary-key ranges of `chunk_size`. Events written before
+    viewer_handle was recorded fall back to the session's viewer. Returns
+    (users, videos, max event id), each total as [seconds, interactions, donations].
+    """
+    ev, ses = models.SessionEvent, models.Session
+    handle = func.coalesce(ev.viewer_handle, ses.viewer_handle)
+    users, videos = {}, {}
+    with engine.connect() as conn:
+        max_id = conn.scalar(select(func.max(ev.id))) or 0
+        for start in range(0, max_id, chunk_size):
+            in_chunk = (ev.id > start, ev.id <= start + chunk_size, ev.status == "approved")
+            sums = (func.sum(ev.seconds_watched), func.sum(ev.interactions), func.sum(ev.donation_amount))
+            for key, *values in conn.execute(
+                select(handle, *sums).select_from(ev).outerjoin(ses, ses.id == ev.session_id).where(*in_chunk).group_by(handle)
+            ):
+                if key is not None:
+                    _fold(users, key, *values)
+            for key, *values in conn.execute(select(ev.video_id, *sums).where(*in_chunk).group_by(ev.video_id)):
+                if key is not None:
+                    _fold(videos, key, *values)
+    return users, videos, max_id
+
+
+def missing_baselines(conn) -> bool:
+    return conn.execute(select(models.User.handle).where(models.User.base_time_spent_on_app.is_(None)).limit(1)).first() is not None
+
+
+def record_baselines(conn, users: dict, batch_size: int = 1000) -> int:
+    """
+    Fill in the base_* totals of users that have none, as their current
+    totals minus what `users` (from scan_event_totals) and their bounty
+    contributions added. Returns the number of users updated.
+    """
+    user = models.User
+    unset = set(conn.scalars(select(user.handle).where(user.base_time_spent_on_app.is_(None))))
+    if not unset:
+        return 0
+    conn.execute(
+        update(user)
+        .where(user.base_time_spent_on_app.is_(None))
+        .values(
+            base_time_spent_on_app=func.coalesce(user.time_spent_on_app, 0),
+            base_total_interactions=func.coalesce(user.total_interactions, 0),
+            base_total_donations=func.coalesce(user.total_donations, 0.0) - _contributed(),
+        )
+    )
+    statement = (
+        update(user)
+        .where(user.handle == bindparam("key"))
+        .values(
+            base_time_spent_on_app=user.base_time_spent_on_app - bindparam("minutes"),
+            base_total_interactions=user.base_total_interactions - bindparam("interactions"),
+            base_total_donations=user.base_total_donations - bindparam("donations"),
+        )
+    )
+    rows = [
+        {"key": k, "minutes": s // SECONDS_PER_APP_MINUTE, "interactions": i, "donations": d}
+        for k, (s, i, d) in users.items() if k in unset
+    ]
+    for i in range(0, len(rows), batch_size):
+        conn.execute(statement, rows[i:i + batch_size])
+    return len(unset)
+
+
+def backfill(engine, chunk_size: int = 50000, batch_size: int = 1000) -> dict:
+    """
+    Rebuild the rolled-up user and video totals from approved session
+    events. User totals are rebuilt as base_* + events (+ bounty
+    contributions for donations), which is what the streaming rollup
+    arrives at; users without a recorded baseline get one derived from
+    their current totals first, so a rebuild of consistent data is a no-op.
+    """
+    users, videos, max_id = scan_event_totals(engine, chunk_size)
+    user = models.User
+    with engine.begin() as conn:
+        baselines = record_baselines(conn, users, batch_size)
+        conn.execute(update(user).values(
+            time_spent_on_app=user.base_time_spent_on_app,
+            total_interactions=user.base_total_interactions,
+            total_donations=user.base_total_donations + _contributed(),
+        ))
+        conn.execute(update(models.Video).values(total_watch_seconds=0, total_interactions=0, total_donations=0.0))
+        user_statement = (
+            update(user)
+            .where(user.handle == bindparam("key"))
+            .values(
+                time_spent_on_app=user.time_spent_on_app + bindparam("minutes"),
+                total_interactions=user.total_interactions + bindparam("interactions"),
+                total_donations=user.total_donations + bindparam("donations"),
+            )
+        )
+        video_statement = (
+            update(models.Video)
+            .where(models.Video.id == bindparam("key"))
+            .values(total_watch_seconds=bindparam("seconds"), total_interactions=bindparam("interactions"), total_donations=bindparam("donations"))
+        )
+        user_rows = [
+            {"key": k, "minutes": s // SECONDS_PER_APP_MINUTE, "interactions": i, "donations": d} for k, (s, i, d) in users.items()
+        ]
+        video_rows = [{"key": k, "seconds": s, "interactions": i, "donations": d} for k, (s, i, d) in videos.items()]
+        for statement, rows in ((user_statement, user_rows), (video_statement, video_rows)):
+            for i in range(0, len(rows), batch_size):
+                conn.execute(statement, rows[i:i + batch_size])
+    return {"events_scanned_to_id": max_id, "users": len(users), "videos": len(videos), "baselines_recorded": baselines}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunk-size", type=int, default=50000, help="session events per scan chunk")
+    parser.add_argument("--batch-size", type=int, default=1000, help="rows per UPDATE batch")
+    args = parser.parse_args()
+
+    from .db import engine
+    from .migrations import upgrade_schema_from_env
+    upgrade_schema_from_env(engine)
+    start = time.perf_counter()
+    result = backfill(engine, chunk_size=args.chunk_size, batch_size=args.batch_size)
+    print(f"rebuilt {result['users']} users and {result['videos']} videos in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+import os
+import threading
+
+import numpy as np
+
+
+class BountySimilarityIndex:
+    """
+    In-process near-duplicate index over bounty descriptions.
+
+    Descriptions are embedded as L2-normalised hashed character n-gram
+    vectors and stored row-wise in a dense NumPy matrix, so a lookup is one
+    matrix-vector product. Rows are added when bounties are created and
+    removed when they close. `last_id` is the highest bounty id seen, so
+    bounties created by other processes can be caught up with a
+    `WHERE id > last_id` query.
+    """
+
+    def __init__(self, n_features: int = 2048, initial_capacity: int = 256):
+        self.n_features = n_features
+        self._vectorizer = None
+        self._matrix = np.zeros((initial_capacity, n_features), dtype=np.float32)
+        self._ids = np.full(initial_capacity, -1, dtype=np.int64)
+        self._descriptions = {}
+        self._rows = {}
+        self._free = []
+        self._size = 0
+        self.last_id = 0
+        self._warm_thread = None
+        self._removed = set()
+        self._lock = threading.Lock()
+
+    @property
+    def vectorizer(self):
+        # scikit-learn is slow to import, so defer it until the first lookup
+        if self._vectorizer is None:
+            from sklearn.feature_extraction.text import HashingVectorizer
+            self._vectorizer = HashingVectorizer(
+                analyzer="char_wb",
+                ngram_range=(3, 5),
+                n_features=self.n_features,
+                alternate_sign=False,
+                norm="l2",
+                lowercase=True,
+            )
+        return self._vectorizer
+
+    def _embed(self, texts: list[str]) -> np.ndarray:
+        return self.vectorizer.transform(texts).toarray().astype(np.float32)
+
+    def _grow(self):
+        capacity = self._matrix.shape[0] * 2
+        matrix = np.zeros((capacity, self._matrix.shape[1]), dtype=np.float32)
+        matrix[: self._size] = self._matrix[: self._size]
+        ids = np.full(capacity, -1, dtype=np.int64)
+        ids[: self._size] = self._ids[: self._size]
+        self._matrix, self._ids = matrix, ids
+
+    def add(self, bounty_id: int, description: str):
+        self.add_many([(bounty_id, description)])
+
+    def add_many(self, items):
+        items = list(items)
+        seen = max((bounty_id for bounty_id, _ in items), default=0)
+        items = [(bounty_id, description) for bounty_id, description in items if description]
+        vectors = self._embed([description for _, description in items]) if items else []
+        with self._lock:
+            # Only advance once the rows are searchable, so a concurrent catch-up never skips them
+            self.last_id = max(self.last_id, seen)
+            for (bounty_id, description), vector in zip(items, vectors):
+                if bounty_id in self._removed:
+                    continue
+                row = self._rows.get(bounty_id)
+                if row is None:
+                    if self._free:
+                        row = self._free.pop()
+                    else:
+                        if self._size == self._matrix.shape[0]:
+                            self._grow()
+                        row = self._size
+                        self._size += 1
+                self._matrix[row] = vector
+                self._ids[row] = bounty_id
+                self._rows[bounty_id] = row
+                self._descriptions[bounty_id] = description
+
+    def add_many_in_background(self, items):
+        """
+        `add_many` on a background thread, so startup does not wait for the
+        scikit-learn import and the embeddings. Lookups made meanwhile see
+        a partial index; callers catch up on ids above `last_id`.
+        """
+        items = list(items)
+
+        def run():
+            try:
+                self.add_many(items)
+            except Exception as e:
+                print(f"Error warming the similarity index: {e}")
+
+        self._warm_thread = threading.Thread(target=run, name="similarity-index-warm", daemon=True)
+        self._warm_thread.start()
+
+    def wait_warm(self, timeout: float | None = None) -> bool:
+        """Block until a background warm-up has finished. Returns False on timeout."""
+        thread = self._warm_thread
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+
+    def remove(self, bounty_id: int):
+        with self._lock:
+            # Closed bounties never reopen; keep a background warm-up from re-adding this one
+            self._removed.add(bounty_id)
+            row = self._rows.pop(bounty_id, None)
+            if row is None:
+                return
+            self._matrix[row] = 0.0
+            self._ids[row] = -1
+            self._descriptions.pop(bounty_id, None)
+            self._free.append(row)
+
+    def top_k(self, description: str, k: int = 5, min_score: float = 0.0) -> list[tuple[int, str, float]]:
+        """Return up to `k` (bounty_id, description, cosine score) tuples, best first."""
+        query = self._embed([description])[0]
+        with self._lock:
+            if not self._rows:
+                return []
+            scores = self._matrix[: self._size] @ query
+            scores[self._ids[: self._size] < 0] = -1.0
+            k = min(k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [
+                (int(self._ids[row]), self._descriptions[int(self._ids[row])], float(scores[row]))
+                for row in top
+                if scores[row] >= min_score and self._ids[row] >= 0
+            ]
+
+    def clear(self):
+        self.wait_warm()
+        self._warm_thread = None
+        with self._lock:
+            self._matrix[:] = 0.0
+            self._ids[:] = -1
+            self._descriptions.clear()
+            self._rows.clear()
+            self._free.clear()
+            self._removed.clear()
+            self._size = 0
+            self.last_id = 0
+
+    def __len__(self):
+        return len(self._rows)
+
+
+def create_similarity_index() -> BountySimilarityIndex:
+    return BountySimilarityIndex(n_features=int(os.getenv("SIMILARITY_N_FEATURES", "2048")))
@@ -0,0 +1,160 @@
+"""
+Short-window velocity features for fraud scoring.
+
+Serving keeps ring-buffer windows per viewer and per video in memory, so
+a feature lookup never touches `session_events`. The batch job replays
+the event table through the same code to materialise a training set:
+
+    python -m app.velocity --output fraud_features.csv
+"""
+import argparse
+import csv
+import os
+import time
+
+from sqlalchemy import func, select
+
+from . import models
+from .rollups import SlidingWindow
+
+VELOCITY_FEATURES = (
+    "viewer_events_1m",
+    "viewer_donations_1m",
+    "viewer_donation_amount_10m",
+    "video_events_1m",
+    "video_donations_1m",
+)
+
+
+class VelocityTracker:
+    """
+    Per-viewer and per-video event and donation counts over the last
+    `short_window` seconds, plus the viewer's donated amount over
+    `long_window` seconds. `observe` counts the event before reading, so a
+    feature row always includes the event being scored. Idle keys are
+    pruned every `prune_every` observations.
+    """
+
+    def __init__(self, short_window: float = 60.0, long_window: float = 600.0, buckets: int = 12, prune_every: int = 10000):
+        self.prune_every = prune_every
+        self._observed = 0
+        self._viewer_short = SlidingWindow(short_window, buckets, fields=2)
+        self._viewer_long = SlidingWindow(long_window, buckets, fields=1)
+        self._video_short = SlidingWindow(short_window, buckets, fields=2)
+
+    def observe(self, viewer_handle, video_id, donation_amount: float, now: float | None = None) -> list:
+        now = now if now is not None else time.time()
+        donated = 1 if donation_amount and donation_amount > 0 else 0
+        self._viewer_short.add(viewer_handle, (1, donated), now)
+        self._viewer_long.add(viewer_handle, (donation_amount or 0.0,), now)
+        self._video_short.add(video_id, (1, donated), now)
+        self._observed += 1
+        if self._observed % self.prune_every == 0:
+            self.prune(now)
+        return self.features(viewer_handle, video_id, now)
+
+    def features(self, viewer_handle, video_id, now: float | None = None) -> list:
+        """Feature values in VELOCITY_FEATURES order."""
+        now = now if now is not None else time.time()
+        viewer_events, viewer_donations = self._viewer_short.totals(viewer_handle, now)
+        (viewer_amount,) = self._viewer_long.totals(viewer_handle, now)
+        video_events, video_donations = self._video_short.totals(video_id, now)
+        return [viewer_events, viewer_donations, viewer_amount, video_events, video_donations]
+
+    def prune(self, now: float | None = None):
+        for window in (self._viewer_short, self._viewer_long, self._video_short):
+            window.prune(now)
+
+    def clear(self):
+        for window in (self._viewer_short, self._viewer_long, self._video_short):
+            window.clear()
+
+
+def create_velocity_tracker() -> VelocityTracker:
+    return VelocityTracker(
+        short_window=float(os.getenv("FRAUD_VELOCITY_SHORT_SECONDS", "60")),
+        long_window=float(os.getenv("FRAUD_VELOCITY_LONG_SECONDS", "600")),
+        buckets=int(os.getenv("FRAUD_VELOCITY_BUCKETS", "12")),
+    )
+
+
+def materialize(engine, path: str, chunk_size: int = 10000) -> int:
+    """
+    Replay session events in time order through a fresh VelocityTracker
+    and write one training row per event (FEATURE_NAMES, then target and
+    status) as CSV. Lifetime viewer totals are replayed too: each row sees
+    the viewer's base_* totals plus the approved events before it, as
+    serving would have, never later activity. Bounty contributions carry
+    no timestamp, so they are left out. Returns the number of rows written.
+    """
+    from .fraud import FEATURE_NAMES, ViewerFeatures, build_features
+    from .rollups import SECONDS_PER_APP_MINUTE, missing_baselines, record_baselines, scan_event_totals
+
+    with engine.connect() as conn:
+        needs_baselines = missing_baselines(conn)
+    if needs_baselines:
+        users, _, _ = scan_event_totals(engine)
+        with engine.begin() as conn:
+            record_baselines(conn, users)
+
+    ev, ses, user = models.SessionEvent, models.Session, models.User
+    created_at = func.coalesce(ev.created_at, ses.started_at)
+    handle = func.coalesce(ev.viewer_handle, ses.viewer_handle)
+    stmt = (
+        select(
+            created_at.label("created_at"), handle.label("viewer_handle"), ev.video_id, ev.seconds_watched, ev.interactions, ev.donation_amount, ev.target, ev.status,
+            user.base_total_interactions, user.base_total_donations, user.base_time_spent_on_app, user.account_age_days,
+        )
+        .select_from(ev)
+        .join(ses, ses.id == ev.session_id)
+        .join(user, user.handle == handle)
+        .where(created_at.is_not(None))
+        .order_by(created_at, ev.id)
+    )
+    tracker = create_velocity_tracker()
+    prior = {}  # viewer -> [seconds, interactions, donations] of approved events so far
+    written = 0
+    with engine.connect() as conn, open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([*FEATURE_NAMES, "target", "status"])
+        result = conn.execution_options(yield_per=chunk_size).execute(stmt)
+        for partition in result.partitions():
+            rows = []
+            for row in partition:
+                seconds, interactions, donations = prior.get(row.viewer_handle, (0, 0, 0.0))
+                viewer = ViewerFeatures(
+                    (row.base_total_interactions or 0) + interactions,
+                    (row.base_total_donations or 0.0) + donations,
+                    (row.base_time_spent_on_app or 0) + seconds // SECONDS_PER_APP_MINUTE,
+                    row.account_age_days,
+                    viewer_handle=row.viewer_handle,
+                )
+                velocity = tracker.observe(row.viewer_handle, row.video_id, row.donation_amount, row.created_at.timestamp())
+                rows.append([*build_features(row, viewer, velocity), row.target, row.status])
+                # Like the streaming rollup, only approved events reach the lifetime totals
+                if row.status == "approved":
+                    totals = prior.setdefault(row.viewer_handle, [0, 0, 0.0])
+                    totals[0] += row.seconds_watched or 0
+                    totals[1] += row.interactions or 0
+                    totals[2] += row.donation_amount or 0.0
+            writer.writerows(rows)
+            written += len(rows)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="fraud_features.csv")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="events fetched per round trip")
+    args = parser.parse_args()
+
+    from .db import engine
+    from .migrations import upgrade_schema_from_env
+    upgrade_schema_from_env(engine)
+    start = time.perf_counter()
+    written = materialize(engine, args.output, chunk_size=args.chunk_size)
+    print(f"wrote {written} rows to {args.output} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from . import models
+
+PRIZE_SPLITS = [0.5, 0.3, 0.2]
+
+
+def record_vote(db: Session, bounty_id: int, submission_id: int) -> bool:
+    """
+    Bump the submission's live tally in the current transaction.
+    Returns False if the submission does not belong to the bounty.
+    """
+    result = db.execute(
+        update(models.BountySubmission)
+        .where(models.BountySubmission.id == submission_id, models.BountySubmission.bounty_id == bounty_id)
+        .values(vote_count=models.BountySubmission.vote_count + 1)
+    )
+    return result.rowcount > 0
+
+
+def recount_votes(conn, submission_ids=None):
+    """
+    Reset live tallies to the number of stored votes, for every submission
+    or only `submission_ids`. Used when votes arrive outside `record_vote`.
+    """
+    votes = (
+        select(func.count(models.BountyVote.id))
+        .where(models.BountyVote.submission_id == models.BountySubmission.id)
+        .scalar_subquery()
+    )
+    stmt = update(models.BountySubmission).values(vote_count=votes)
+    if submission_ids is not None:
+        stmt = stmt.where(models.BountySubmission.id.in_(submission_ids))
+    conn.execute(stmt.execution_options(synchronize_session=False))
+
+
+def compute_winners(db: Session, bounty: models.Bounty) -> list[models.BountyWinner]:
+    """
+    Rank the bounty's top submissions from the live tallies and stage the
+    winner rows. Ties go to the earlier submission.
+    """
+    top = (
+        db.query(models.BountySubmission)
+        .filter(models.BountySubmission.bounty_id == bounty.id, models.BountySubmission.vote_count > 0)
+        .order_by(models.BountySubmission.vote_count.desc(), models.BountySubmission.id)
+        .limit(len(PRIZE_SPLITS))
+        .all()
+    )
+    winners = [
+        models.BountyWinner(
+            bounty_id=bounty.id,
+            rank=i + 1,
+            submission_id=submission.id,
+            creator_handle=submission.creator_handle,
+            video_id=submission.video_id,
+            votes=submission.vote_count,
+            prize=round(bounty.prize_pool * PRIZE_SPLITS[i], 2),
+        )
+        for i, submission in enumerate(top)
+    ]
+    db.add_all(winners)
+    return winners
+
+
+def close_bounty(db: Session, bounty: models.Bounty) -> list[models.BountyWinner] | None:
+    """
+    Close the bounty, stage its winners and credit their wallets in the
+    current transaction. Returns None if another caller already closed it.
+    """
+    claimed = db.execute(
+        update(models.Bounty)
+        .where(models.Bounty.id == bounty.id, models.Bounty.is_closed == False)
+        .values(is_closed=True)
+        .execution_options(synchronize_session=False)
+    )
+    if claimed.rowcount == 0:
+        return None
+    winners = compute_winners(db, bounty)
+    for w in winners:
+        # Add prize to winner's wallet
+        db.execute(
+            update(models.User)
+            .where(models.User.handle == w.creator_handle)
+            .values(wallet=models.User.wallet + w.prize)
+            .execution_options(synchronize_session=False)
+        )
+    return winners
+
+
+def get_winners(db: Session, bounty_id: int) -> list[models.BountyWinner]:
+    return (
+        db.query(models.BountyWinner)
+        .filter(models.BountyWinner.bounty_id == bounty_id)
+        .order_by(models.BountyWinner.rank)
+        .all()
+    )
+
+
+def winner_dict(winner: models.BountyWinner) -> dict:
+    return {
+        "submission_id": winner.submission_id,
+        "creator_handle": winner.creator_handle,
+        "video_id": winner.video_id,
+        "prize": winner.prize
+    }
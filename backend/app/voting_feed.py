@@ -0,0 +1,112 @@
+import hashlib
+import os
+
+from .cache import LRUCache
+from . import models
+
+_MASK64 = (1 << 64) - 1
+_ROUNDS = 4
+
+
+def _mix(x: int) -> int:
+    # splitmix64 finaliser
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+class KeyedPermutation:
+    """
+    Pseudo-random bijection on range(n) evaluated one index at a time.
+
+    A balanced Feistel network permutes the enclosing power-of-four domain
+    and cycle-walking folds values outside range(n) back in, so any
+    position maps to its element in O(1) expected time without
+    materialising the shuffled list.
+    """
+
+    def __init__(self, n: int, key: int):
+        self.n = n
+        half_bits = max(1, (max(n - 1, 1).bit_length() + 1) // 2)
+        self._half_bits = half_bits
+        self._half_mask = (1 << half_bits) - 1
+        self._round_keys = [_mix(key ^ (r * 0xD1B54A32D192ED03)) for r in range(_ROUNDS)]
+
+    def _encrypt(self, x: int) -> int:
+        left, right = x >> self._half_bits, x & self._half_mask
+        for rk in self._round_keys:
+            left, right = right, left ^ (_mix(right ^ rk) & self._half_mask)
+        return (left << self._half_bits) | right
+
+    def __getitem__(self, i: int) -> int:
+        if not 0 <= i < self.n:
+            raise IndexError(i)
+        x = self._encrypt(i)
+        while x >= self.n:
+            x = self._encrypt(x)
+        return x
+
+
+class VotingFeed:
+    """
+    Fair-exposure ordering of a bounty's submissions for the judging feed.
+
+    Sessions are grouped into rounds of `n` consecutive session ids (n being
+    the number of submissions). Every session in a round sees the same
+    keyed shuffle, rotated by its position in the round, so across a round
+    each submission is shown exactly once in every slot. The shuffle is
+    re-keyed each round and per bounty, and only the bounty's submission
+    ids are cached, never per-session orderings.
+    """
+
+    def __init__(self, seed: str = "", maxsize: int = 1024, ttl: float | None = 300.0):
+        self.seed = seed
+        self._submissions = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    def _key(self, bounty_id: int, round_no: int) -> int:
+        digest = hashlib.blake2b(f"{self.seed}:{bounty_id}:{round_no}".encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big")
+
+    def submission_ids(self, db, bounty_id: int) -> tuple[int, ...]:
+        ids = self._submissions.get(bounty_id)
+        if ids is None:
+            rows = (
+                db.query(models.BountySubmission.id)
+                .filter(models.BountySubmission.bounty_id == bounty_id)
+                .order_by(models.BountySubmission.id)
+                .all()
+            )
+            ids = tuple(row[0] for row in rows)
+            self._submissions.set(bounty_id, ids)
+        return ids
+
+    def order(self, ids, bounty_id: int, session_id: int, offset: int, limit: int) -> list[int]:
+        """Submission ids at positions [offset, offset + limit) of the session's feed."""
+        n = len(ids)
+        if n == 0:
+            return []
+        round_no, rotation = divmod(session_id, n)
+        perm = KeyedPermutation(n, self._key(bounty_id, round_no))
+        stop = min(offset + limit, n)
+        return [ids[perm[(i + rotation) % n]] for i in range(offset, stop)]
+
+    def page(self, db, bounty_id: int, session_id: int, offset: int, limit: int) -> tuple[list[int], int]:
+        """Return a page of submission ids for the session and the feed length."""
+        ids = self.submission_ids(db, bounty_id)
+        return self.order(ids, bounty_id, session_id, offset, limit), len(ids)
+
+    def invalidate(self, bounty_id: int):
+        """Drop the cached submission ids after a new submission."""
+        self._submissions.pop(bounty_id)
+
+    def clear(self):
+        self._submissions.clear()
+
+
+def create_voting_feed() -> VotingFeed:
+    return VotingFeed(
+        seed=os.getenv("VOTING_FEED_SEED", ""),
+        maxsize=int(os.getenv("VOTING_FEED_CACHE_SIZE", "1024")),
+        ttl=float(os.getenv("VOTING_FEED_CACHE_TTL", "300")),
+    )
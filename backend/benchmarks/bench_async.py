@@ -0,0 +1,72 @@
+"""
+Concurrent request capacity of the async hot endpoints versus a sync
+(threadpool) endpoint, driven in-process over ASGI.
+
+Shrinking the threadpool with --threadpool-tokens shows how sync routes
+queue behind it while async routes keep serving.
+
+    DB_EPHEMERAL=true python -m benchmarks.bench_async --concurrency 64 --requests 2000 --threadpool-tokens 4
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import anyio.to_thread
+import httpx
+
+# The seed bounties' deadlines have passed, so the lifecycle scheduler would
+# close them at startup and POST /bounty/1/contribute would 404
+os.environ["BOUNTY_SCHEDULER_ENABLED"] = "false"
+
+from app.main import app, similarity_index  # noqa: E402
+
+
+async def drive(client, concurrency: int, total: int, make_request) -> tuple[float, float]:
+    latencies = []
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with sem:
+            start = time.perf_counter()
+            r = await make_request(client, i)
+            latencies.append(time.perf_counter() - start)
+            r.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return total / elapsed, latencies[int(len(latencies) * 0.95) - 1] * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threadpool-tokens", type=int, default=40)
+    args = parser.parse_args()
+
+    anyio.to_thread.current_default_thread_limiter().total_tokens = args.threadpool_tokens
+    async with app.router.lifespan_context(app):
+        # Measure steady state, not the one-off similarity index warm-up
+        await anyio.to_thread.run_sync(similarity_index.wait_warm)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            session_id = (await client.post("/session/start", json={"viewer_handle": "PixelPilot"})).json()["session_id"]
+            event = {"session_id": session_id, "video_id": 1, "viewer_handle": "PixelPilot", "seconds_watched": 30, "interactions": 2, "donation_amount": 0.5}
+            cases = [
+                ("async POST /session/event", lambda c, i: c.post("/session/event", json=event)),
+                ("async GET /bounty", lambda c, i: c.get("/bounty", params={"limit": 20})),
+                ("async POST /bounty/{id}/contribute", lambda c, i: c.post("/bounty/1/contribute", params={"viewer_handle": "VFXValkyrie", "amount": 0.01})),
+                ("sync  GET /video/{id}", lambda c, i: c.get(f"/video/{i % 18 + 1}")),
+            ]
+            print(f"threadpool tokens={args.threadpool_tokens} concurrency={args.concurrency}")
+            print(f"{'endpoint':<38} {'req/s':>8} {'p95 ms':>8}")
+            for name, make_request in cases:
+                rps, p95 = await drive(client, args.concurrency, args.requests, make_request)
+                print(f"{name:<38} {rps:>8.0f} {p95:>8.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,106 @@
+"""
+Concurrent donations to one hot bounty: the old read-modify-write ORM path
+versus the SQL-side increment in app/contributions.py, with and without
+batch mode. Reports throughput and lost updates.
+
+    python -m benchmarks.bench_contributions --threads 16 --donations 200
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db import Base
+from app import models
+from app.contributions import ContributionBatcher, contribute
+
+
+def legacy_contribute(engine, bounty_id: int, viewer_handle: str, amount: float) -> float:
+    # What contribute_bounty used to do
+    with Session(engine) as db:
+        bounty = db.get(models.Bounty, bounty_id)
+        db.add(models.BountyContribution(bounty_id=bounty_id, viewer_handle=viewer_handle, amount=amount))
+        bounty.prize_pool += amount
+        viewer = db.get(models.User, viewer_handle)
+        viewer.wallet -= amount
+        viewer.total_donations += amount
+        db.commit()
+        return bounty.prize_pool
+
+
+def atomic_contribute(engine, bounty_id: int, viewer_handle: str, amount: float) -> float:
+    with Session(engine) as db:
+        return contribute(db, bounty_id, viewer_handle, amount)
+
+
+def run(name: str, donate, threads: int, donations: int) -> dict:
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False, "timeout": 30}, pool_size=threads)
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add_all([models.User(handle=f"viewer{i}", wallet=1e9) for i in range(threads)])
+        db.add(models.Bounty(id=1, description="hot", creator_handle="viewer0", prize_pool=0.0,
+                             cutoff_date=datetime.now(), judging_start=datetime.now(), judging_end=datetime.now()))
+        db.commit()
+
+    fn = donate(engine)
+    errors = 0
+
+    def worker(i):
+        nonlocal errors
+        for _ in range(donations):
+            try:
+                fn(1, f"viewer{i}", 1.0)
+            except Exception:
+                errors += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as ex:
+        list(ex.map(worker, range(threads)))
+    elapsed = time.perf_counter() - start
+
+    with Session(engine) as db:
+        pool = db.get(models.Bounty, 1).prize_pool
+        rows = db.query(models.BountyContribution).count()
+    engine.dispose()
+    return {
+        "mode": name,
+        "donations_per_sec": (threads * donations - errors) / elapsed,
+        "errors": errors,
+        "lost_updates": rows - int(pool),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--donations", type=int, default=200, help="donations per thread")
+    args = parser.parse_args()
+
+    batchers = []
+
+    def batched(engine):
+        batcher = ContributionBatcher(engine)
+        batchers.append(batcher)
+        return batcher.contribute
+
+    modes = [
+        ("legacy", lambda engine: lambda *a: legacy_contribute(engine, *a)),
+        ("atomic", lambda engine: lambda *a: atomic_contribute(engine, *a)),
+        ("batched", batched),
+    ]
+    print(f"{'mode':<8} {'donations/s':>12} {'errors':>7} {'lost updates':>13}")
+    for name, donate in modes:
+        r = run(name, donate, args.threads, args.donations)
+        print(f"{r['mode']:<8} {r['donations_per_sec']:>12.0f} {r['errors']:>7} {r['lost_updates']:>13}")
+    for batcher in batchers:
+        batcher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Compare the hot filter_by lookups with and without the indexes declared in
+app/models.py.
+
+    python -m benchmarks.bench_indexes --rows 200000 --lookups 2000
+"""
+import argparse
+import random
+import time
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import Session
+
+from app.db import Base
+from app import models
+
+BOUNTIES = 1000
+USERS = 50000
+
+LOOKUPS = {
+    "bounty_submissions": (
+        models.BountySubmission,
+        lambda r: dict(bounty_id=r.randrange(BOUNTIES), creator_handle=f"user{r.randrange(USERS)}"),
+    ),
+    "bounty_contributions": (
+        models.BountyContribution,
+        lambda r: dict(bounty_id=r.randrange(BOUNTIES), viewer_handle=f"user{r.randrange(USERS)}"),
+    ),
+    "bounty_votes": (
+        models.BountyVote,
+        lambda r: dict(bounty_id=r.randrange(BOUNTIES), submission_id=r.randrange(BOUNTIES * 10), viewer_handle=f"user{r.randrange(USERS)}"),
+    ),
+    "bounty_follows": (
+        models.BountyFollow,
+        lambda r: dict(bounty_id=r.randrange(BOUNTIES), user_handle=f"user{r.randrange(USERS)}"),
+    ),
+}
+
+
+def seed(engine, rows: int):
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        conn.execute(insert(models.BountySubmission), [
+            dict(bounty_id=rng.randrange(BOUNTIES), creator_handle=f"user{rng.randrange(USERS)}", video_id=i)
+            for i in range(rows)
+        ])
+        conn.execute(insert(models.BountyContribution), [
+            dict(bounty_id=rng.randrange(BOUNTIES), viewer_handle=f"user{rng.randrange(USERS)}", amount=1.0)
+            for _ in range(rows)
+        ])
+        # Unique rows so the constraints hold
+        conn.execute(insert(models.BountyVote), [
+            dict(bounty_id=i % BOUNTIES, submission_id=i % (BOUNTIES * 10), viewer_handle=f"user{i % USERS}")
+            for i in range(rows)
+        ])
+        conn.execute(insert(models.BountyFollow), [
+            dict(bounty_id=i % BOUNTIES, user_handle=f"user{i // BOUNTIES}")
+            for i in range(rows)
+        ])
+
+
+def time_lookups(engine, lookups: int) -> dict:
+    results = {}
+    with Session(engine) as db:
+        for table, (model, make_filter) in LOOKUPS.items():
+            rng = random.Random(7)
+            filters = [make_filter(rng) for _ in range(lookups)]
+            plan = db.execute(
+                text(f"EXPLAIN QUERY PLAN SELECT * FROM {table} WHERE " + " AND ".join(f"{k} = :{k}" for k in filters[0])),
+                filters[0],
+            ).fetchall()
+            start = time.perf_counter()
+            for f in filters:
+                db.query(model).filter_by(**f).first()
+            elapsed = time.perf_counter() - start
+            results[table] = (elapsed / lookups * 1e6, plan[-1][-1])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--lookups", type=int, default=1000)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    seed(engine, args.rows)
+    indexed = time_lookups(engine, args.lookups)
+
+    with engine.begin() as conn:
+        for table in LOOKUPS:
+            # Materialise the list first; an open sqlite_master cursor blocks DROP TABLE
+            names = conn.execute(text(f"SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = '{table}'")).scalars().all()
+            for name in names:
+                # Constraint-backed indexes can't be dropped, so copy the table without them
+                if name.startswith("sqlite_autoindex"):
+                    conn.execute(text(f"CREATE TABLE {table}_scan AS SELECT * FROM {table}"))
+                    conn.execute(text(f"DROP TABLE {table}"))
+                    conn.execute(text(f"ALTER TABLE {table}_scan RENAME TO {table}"))
+                    break
+                conn.execute(text(f"DROP INDEX {name}"))
+    scanned = time_lookups(engine, args.lookups)
+
+    print(f"{'table':<22} {'scan us/op':>12} {'seek us/op':>12} {'speedup':>8}  plan (indexed)")
+    for table in LOOKUPS:
+        scan_us, _ = scanned[table]
+        seek_us, plan = indexed[table]
+        print(f"{table:<22} {scan_us:>12.1f} {seek_us:>12.1f} {scan_us / seek_us:>7.1f}x  {plan}")
+
+
+if __name__ == "__main__":
+    main()
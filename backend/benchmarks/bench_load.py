@@ -0,0 +1,274 @@
+"""
+Repeatable load benchmark for the Duuck API.
+
+Seeds a throwaway SQLite database with synthetic data at the requested
+scale, then drives the real FastAPI app in-process with concurrent async
+clients and reports p50/p95/p99 latency and throughput per endpoint. The
+idea moderation service is replaced by app.moderation_stub.
+
+    python -m benchmarks.bench_load --bounties 2000 --votes 1000000 --events 1000000 \\
+        --requests 2000 --concurrency 32 --output bench_output.json
+    python -m benchmarks.bench_load --compare bench_output.json --output new.json
+
+Results are written as JSON (with the git commit) so runs can be compared.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+CHUNK = 50000
+
+
+def configure_env(db_path: str):
+    # Must run before app modules are imported; load_dotenv does not override these
+    os.environ["SQLALCHEMY_DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ.pop("ASYNC_SQLALCHEMY_DATABASE_URL", None)
+    os.environ["DB_EPHEMERAL"] = "false"
+    os.environ["SEED_DEMO_DATA"] = "false"
+    os.environ["FRAUD_MODEL_RELOAD_SECONDS"] = "0"
+    # Keep finished bounties open so the distribute endpoint itself is measured
+    os.environ["BOUNTY_SCHEDULER_ENABLED"] = "false"
+
+
+def _chunks(rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == CHUNK:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def seed(engine, args, rng: random.Random) -> dict:
+    """Bulk-load synthetic users, videos, bounties, submissions, votes, sessions and events."""
+    from sqlalchemy import insert
+    from app import models
+
+    now = datetime.now()
+    n_sub = args.bounties * args.submissions
+    with engine.begin() as conn:
+        for batch in _chunks(
+            dict(handle=f"user{i}", wallet=1e9, total_donations=rng.uniform(0, 100), time_spent_on_app=rng.randint(1, 200),
+                 account_age_days=rng.randint(1, 400), total_interactions=rng.randint(0, 500))
+            for i in range(args.users)
+        ):
+            conn.execute(insert(models.User), batch)
+        for batch in _chunks(
+            dict(id=i + 1, creator_handle=f"user{i % args.users}", title=f"video {i}", phash=f"{rng.getrandbits(64):016x}",
+                 length=rng.randint(10, 120), views=rng.randint(0, 10000), votes=0, likes=rng.randint(0, 1000))
+            for i in range(n_sub)
+        ):
+            conn.execute(insert(models.Video), batch)
+
+        # Phases: a third open for submissions, a third in judging, a third finished
+        phases = {}
+        bounties = []
+        for i in range(args.bounties):
+            phase = i % 3
+            if phase == 0:
+                cutoff, start, end = now + timedelta(days=5), now + timedelta(days=6), now + timedelta(days=12)
+            elif phase == 1:
+                cutoff, start, end = now - timedelta(days=2), now - timedelta(days=1), now + timedelta(days=6)
+            else:
+                cutoff, start, end = now - timedelta(days=9), now - timedelta(days=8), now - timedelta(days=1)
+            phases[i + 1] = phase
+            bounties.append(dict(id=i + 1, description=f"synthetic bounty {i} " + " ".join(rng.sample(WORDS, 8)),
+                                 creator_handle=f"user{rng.randrange(args.users)}", prize_pool=round(rng.uniform(10, 1000), 2),
+                                 cutoff_date=cutoff, judging_start=start, judging_end=end, is_closed=False))
+        for batch in _chunks(bounties):
+            conn.execute(insert(models.Bounty), batch)
+
+        vote_counts = np.zeros(n_sub, dtype=np.int64)
+        sub_bounty = np.repeat(np.arange(1, args.bounties + 1), args.submissions)
+        # Popularity is skewed so a few submissions collect most votes
+        targets = rng_np(rng).zipf(1.5, size=args.votes) % n_sub
+        for i in range(0, args.votes, CHUNK):
+            rows = []
+            for sub in targets[i:i + CHUNK]:
+                # Voter handles are unique per submission, which satisfies the vote constraint
+                rows.append(dict(bounty_id=int(sub_bounty[sub]), submission_id=int(sub) + 1,
+                                 viewer_handle=f"voter{vote_counts[sub]}"))
+                vote_counts[sub] += 1
+            conn.execute(insert(models.BountyVote), rows)
+        for batch in _chunks(
+            dict(id=i + 1, bounty_id=int(sub_bounty[i]), creator_handle=f"user{(i + 1) % args.users}", video_id=i + 1,
+                 vote_count=int(vote_counts[i]))
+            for i in range(n_sub)
+        ):
+            conn.execute(insert(models.BountySubmission), batch)
+
+        for batch in _chunks(dict(id=i + 1, viewer_handle=f"user{i % args.users}") for i in range(args.sessions)):
+            conn.execute(insert(models.Session), batch)
+        for batch in _chunks(
+            dict(session_id=rng.randrange(args.sessions) + 1, video_id=rng.randrange(n_sub) + 1, seconds_watched=rng.randint(1, 120),
+                 interactions=rng.randint(0, 5), donation_amount=round(rng.expovariate(1.0), 2), status="approved")
+            for _ in range(args.events)
+        ):
+            conn.execute(insert(models.SessionEvent), batch)
+
+    return {
+        "judging": [b for b, p in phases.items() if p == 1],
+        "finished": [b for b, p in phases.items() if p == 2],
+        "open": [b for b, p in phases.items() if p == 0],
+        "submissions": args.submissions,
+    }
+
+
+def rng_np(rng: random.Random):
+    return np.random.default_rng(rng.getrandbits(32))
+
+
+WORDS = ("drone montage slow motion tutorial studio travel vlog lightning effect pet fails animation graphics "
+         "timelapse transition color grading sound design foley masking particle explosion speedrun city night "
+         "sunrise skate dance recipe cooking gaming retro synth").split()
+
+
+def scenarios(data: dict, args, rng: random.Random) -> dict:
+    def sub_id(bounty_id):
+        return (bounty_id - 1) * data["submissions"] + rng.randrange(data["submissions"]) + 1
+
+    finished = list(data["finished"])
+    rng.shuffle(finished)
+    return {
+        "POST /session/event": lambda c, i: c.post("/session/event", json={
+            "session_id": rng.randrange(args.sessions) + 1, "video_id": rng.randrange(args.bounties * args.submissions) + 1,
+            "viewer_handle": "bench", "seconds_watched": rng.randint(1, 120), "interactions": rng.randint(0, 5),
+            "donation_amount": round(rng.expovariate(1.0), 2)}),
+        "GET /bounty": lambda c, i: c.get("/bounty", params={"limit": 50, "offset": rng.randrange(max(args.bounties - 50, 1))}),
+        "POST /bounty/{id}/vote": lambda c, i: (lambda b: c.post(f"/bounty/{b}/vote", params={
+            "submission_id": sub_id(b), "viewer_handle": f"benchvoter{i}"}))(rng.choice(data["judging"])),
+        "POST /bounty/{id}/contribute": lambda c, i: c.post(f"/bounty/{rng.choice(data['open'])}/contribute", params={
+            "viewer_handle": f"user{rng.randrange(args.users)}", "amount": 1.0}),
+        "POST /bounty/create": lambda c, i: c.post("/bounty/create", json={
+            "description": f"bench bounty {i} " + " ".join(rng.sample(WORDS, 6)), "creator_handle": f"user{rng.randrange(args.users)}",
+            "prize_pool": 10.0, "cutoff_date": "2030-01-01T00:00:00", "judging_start": "2030-01-02T00:00:00",
+            "judging_end": "2030-01-09T00:00:00"}),
+        # Each finished bounty can only be distributed once
+        "POST /bounty/{id}/distribute": (lambda c, i: c.post(f"/bounty/{finished[i]}/distribute"), len(finished)),
+    }
+
+
+async def drive(client, make_request, total: int, concurrency: int) -> dict:
+    latencies = []
+    statuses = {}
+    counter = iter(range(total))
+
+    async def worker():
+        for i in counter:
+            start = time.perf_counter()
+            r = await make_request(client, i)
+            latencies.append(time.perf_counter() - start)
+            statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    ms = np.array(latencies) * 1000
+    return {
+        "requests": total,
+        "throughput_rps": total / elapsed,
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "statuses": {str(k): v for k, v in sorted(statuses.items())},
+    }
+
+
+async def run(args) -> dict:
+    import httpx
+    from app import main, moderation_stub
+    from app.db import Base, engine
+
+    rng = random.Random(args.seed)
+    t0 = time.perf_counter()
+    Base.metadata.create_all(engine)
+    data = seed(engine, args, rng)
+    seed_seconds = time.perf_counter() - t0
+    print(f"seeded in {seed_seconds:.1f}s")
+
+    main.moderation.transport = httpx.ASGITransport(app=moderation_stub.app)
+    main.moderation.base_url = "http://moderation-stub"
+    results = {}
+    async with main.app.router.lifespan_context(main.app):
+        # Measure steady state, not the one-off similarity index warm-up
+        await asyncio.to_thread(main.similarity_index.wait_warm)
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            for name, scenario in scenarios(data, args, rng).items():
+                make_request, limit = scenario if isinstance(scenario, tuple) else (scenario, None)
+                total = min(args.requests, limit) if limit is not None else args.requests
+                if total == 0:
+                    continue
+                results[name] = await drive(client, make_request, total, args.concurrency)
+    return {"seed_seconds": seed_seconds, "endpoints": results}
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report: dict, baseline: dict | None):
+    header = f"{'endpoint':<30} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    if baseline:
+        header += f" {'p95 vs base':>12}"
+    print(header)
+    for name, r in report["endpoints"].items():
+        line = f"{name:<30} {r['throughput_rps']:>8.0f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f}"
+        base = (baseline or {}).get("endpoints", {}).get(name)
+        if base:
+            line += f" {(r['p95_ms'] / base['p95_ms'] - 1) * 100:>+11.1f}%"
+        print(line + f"  {r['statuses']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--bounties", type=int, default=1000)
+    parser.add_argument("--submissions", type=int, default=10, help="submissions per bounty")
+    parser.add_argument("--votes", type=int, default=200000)
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--events", type=int, default=200000)
+    parser.add_argument("--requests", type=int, default=1000, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--db", help="SQLite file to seed (default: a temp file)")
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="duuck-bench-"), "bench.db")
+    if os.path.exists(db_path):
+        raise SystemExit(f"{db_path} already exists; pass a new path")
+    configure_env(db_path)
+
+    report = asyncio.run(run(args))
+    report.update({
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "params": {k: v for k, v in vars(args).items() if k not in ("output", "compare", "db")},
+    })
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Time to first request for a fresh worker process: module import, lifespan
+startup, and the first scored /session/event (which waits for the fraud
+model if the background load has not finished).
+
+    python -m benchmarks.bench_startup --runs 5
+    SEED_DEMO_DATA=false python -m benchmarks.bench_startup
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+def ensure_viewer():
+    # Without SEED_DEMO_DATA the database starts empty
+    from app.db import SessionLocal
+    from app import models
+    with SessionLocal() as db:
+        if db.get(models.User, "PixelPilot") is None:
+            db.add(models.User(handle="PixelPilot"))
+            db.commit()
+
+
+def child():
+    t0 = time.perf_counter()
+    from app.main import app
+    t_import = time.perf_counter()
+
+    import asyncio
+    import httpx
+
+    async def run():
+        async with app.router.lifespan_context(app):
+            t_ready = time.perf_counter()
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                r = await client.get("/bounty", params={"limit": 1})
+                r.raise_for_status()
+                t_first = time.perf_counter()
+                await asyncio.to_thread(ensure_viewer)
+                session = await client.post("/session/start", json={"viewer_handle": "PixelPilot"})
+                event = {"session_id": session.json()["session_id"], "video_id": 1, "viewer_handle": "PixelPilot", "seconds_watched": 10}
+                (await client.post("/session/event", json=event)).raise_for_status()
+                t_scored = time.perf_counter()
+        return t_ready, t_first, t_scored
+
+    t_ready, t_first, t_scored = asyncio.run(run())
+    print(json.dumps({
+        "import_ms": (t_import - t0) * 1000,
+        "lifespan_ms": (t_ready - t_import) * 1000,
+        "first_request_ms": (t_first - t0) * 1000,
+        "first_scored_event_ms": (t_scored - t0) * 1000,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child()
+        return
+
+    env = {**os.environ, "DB_EPHEMERAL": "true"}
+    results = []
+    for _ in range(args.runs):
+        out = subprocess.run([sys.executable, "-m", "benchmarks.bench_startup", "--child"], env=env, capture_output=True, text=True, check=True)
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    print(f"{'metric':<24} {'median ms':>10} {'max ms':>10}")
+    for key in results[0]:
+        values = [r[key] for r in results]
+        print(f"{key:<24} {statistics.median(values):>10.1f} {max(values):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import os
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import Session
+
+os.environ.setdefault("SQLALCHEMY_DATABASE_URL", "sqlite://")
+
+from app import models  # noqa: E402
+from app.bounty_feed import load_bounty_feed  # noqa: E402
+from app.db import Base  # noqa: E402
+
+
+def _seed(engine, bounties: int, submissions_per_bounty: int):
+    dates = dict(cutoff_date=datetime(2030, 1, 1), judging_start=datetime(2030, 1, 2), judging_end=datetime(2030, 1, 3))
+    with engine.begin() as conn:
+        conn.execute(insert(models.User), [{"handle": f"creator{i}"} for i in range(submissions_per_bounty)] + [{"handle": "host"}])
+        conn.execute(insert(models.Video), [
+            {"id": i + 1, "creator_handle": f"creator{i}", "title": f"video {i}", "length": 30}
+            for i in range(submissions_per_bounty)
+        ])
+        conn.execute(insert(models.Bounty), [
+            {"id": b + 1, "description": f"bounty {b}", "creator_handle": "host", "prize_pool": 10.0 + b, **dates}
+            for b in range(bounties)
+        ])
+        conn.execute(insert(models.BountySubmission), [
+            {"bounty_id": b + 1, "creator_handle": f"creator{i}", "video_id": i + 1}
+            for b in range(bounties)
+            for i in range(submissions_per_bounty)
+        ])
+    return list(range(1, bounties + 1))
+
+
+def _count_statements(engine, fn):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        result = fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return result, statements
+
+
+@pytest.mark.parametrize("bounties, submissions_per_bounty", [(1, 1), (25, 8)])
+def test_feed_runs_two_statements(bounties, submissions_per_bounty):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    ids = _seed(engine, bounties, submissions_per_bounty)
+
+    with Session(engine) as db:
+        feed, statements = _count_statements(engine, lambda: load_bounty_feed(db, ids))
+
+    assert len(statements) == 2
+    assert [b.id for b in feed] == ids
+    assert all(len(b.current_videos) == submissions_per_bounty for b in feed)
+
+
+def test_feed_keeps_first_video_per_creator():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    ids = _seed(engine, 1, 2)
+    with engine.begin() as conn:
+        conn.execute(insert(models.Video).values(id=3, creator_handle="creator0", title="second take", length=30))
+        conn.execute(insert(models.BountySubmission).values(bounty_id=1, creator_handle="creator0", video_id=3))
+
+    with Session(engine) as db:
+        (bounty,) = load_bounty_feed(db, ids)
+
+    assert [v["id"] for v in bounty.current_videos] == [1, 2]